@@ -0,0 +1,275 @@
+import csv
+import os
+import re
+from itertools import islice
+import warnings
+from datetime import timezone
+import numpy as np
+from dateutil import parser
+
+TOKENS_PER_ROW = 5
+STANDARD_GRAVITY = 9.80665
+SCI_SPINNER_COLUMNS = ('timestamp', 'x_acc', 'y_acc', 'z_acc')
+DEFAULT_CHUNK_BYTES = 16 * 1024 * 1024
+BYTES_PER_ROW_ESTIMATE = 64
+STREAMING_THRESHOLD_BYTES = 256 * 1024 * 1024
+SUPPORTED_FORMATS = (
+    "(1) Timestamp (yyyy-mm-dd hh:mm:ss.sss), X (g), Y (g), Z (g)\n"
+    "(2) Timestamp (s), X (m/s²), Y (m/s²), Z (m/s²)"
+)
+INVALID_CSV_MESSAGE = "Invalid CSV file format.\n\nSupported CSV file formats:\n" + SUPPORTED_FORMATS
+TIMESTAMP_ROW_DTYPE = [('timestamp', 'S64'), ('x', np.float64), ('y', np.float64), ('z', np.float64)]
+
+class AccelerometerData:
+    def __init__(self, time_in_hours, x, y, z, source_format):
+        self.time_in_hours = np.ascontiguousarray(time_in_hours, dtype=np.float64)
+        self.x = np.ascontiguousarray(x, dtype=np.float64)
+        self.y = np.ascontiguousarray(y, dtype=np.float64)
+        self.z = np.ascontiguousarray(z, dtype=np.float64)
+        self.source_format = source_format
+
+    def __len__(self):
+        return self.time_in_hours.size
+
+    def columns(self):
+        return self.time_in_hours, self.x, self.y, self.z
+
+
+ISO_TIME_PATTERN = re.compile(r"\d{2}:\d{2}(:\d{2}(\.\d{1,6})?)?$")
+
+class AccelerometerFile:
+    def __init__(self, file_path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+        self.file_path = file_path
+        self.chunk_bytes = chunk_bytes
+        self.source_format = detect_csv_format(file_path)
+
+    def __bool__(self):
+        return os.path.getsize(self.file_path) > 0
+
+    def iterate_chunks(self, report=None):
+        if self.source_format == "sci_spinner":
+            return iterate_sci_spinner_csv(self.file_path, max(1, self.chunk_bytes // BYTES_PER_ROW_ESTIMATE), report)
+        return iterate_timestamp_csv(self.file_path, self.chunk_bytes, report)
+
+def detect_csv_format(file_path):
+    with open(file_path, 'r') as file:
+        header = next(csv.reader(file), [])
+    return "sci_spinner" if all(name in header for name in SCI_SPINNER_COLUMNS) else "timestamp"
+
+def tokenize_timestamp_csv(text):
+    return text.replace("   ", " ").replace('\t', ' ').replace('\n', ' ').replace(',', ' ').split(' ')
+
+def read_timestamp_csv(file_path):
+    columns = load_timestamp_columns(file_path)
+    if columns is None:
+        with open(file_path, 'r') as file:
+            tokens = tokenize_timestamp_csv(file.read())
+        columns = parse_timestamp_tokens(tokens)
+    return AccelerometerData(*columns, "timestamp")
+
+def load_timestamp_columns(file_path):
+    # comma-separated rows with fixed-width timestamps are parsed from bytes; any other layout goes through the tokenizer
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            rows = np.loadtxt(file_path, delimiter=',', dtype=TIMESTAMP_ROW_DTYPE, ndmin=1)
+    except ValueError:
+        return None
+    stamps = np.ascontiguousarray(rows['timestamp'])
+    if stamps.size == 0:
+        return None
+
+    width = len(stamps[0])
+    split = stamps[0].find(b' ')
+    if width >= stamps.dtype.itemsize or split < 0 or (np.strings.str_len(stamps) != width).any():
+        return None
+    chars = stamps.view(np.uint8).reshape(-1, stamps.dtype.itemsize)
+    if (chars[:, split] != ord(' ')).any():
+        return None
+    first = np.ascontiguousarray(chars[:, :split]).view(f'S{split}').ravel()
+    second = np.ascontiguousarray(chars[:, split + 1:width]).view(f'S{width - split - 1}').ravel()
+
+    layout = detect_timestamp_layout(first[0].decode(), second[0].decode())
+    if layout is None:
+        return None
+    dates, times = (first, second) if layout == "date_time" else (second, first)
+    time_of_day = parse_fixed_width_times(times)
+    if time_of_day is None:
+        return None
+    try:
+        timestamps = parse_date_runs(dates) + time_of_day.astype('timedelta64[us]')
+    except (ValueError, OverflowError):
+        return None
+    return hours_since(timestamps, timestamps[0]), rows['x'], rows['y'], rows['z']
+
+def find_sci_spinner_columns(header):
+    try:
+        return [header.index(name) for name in SCI_SPINNER_COLUMNS]
+    except ValueError:
+        raise ValueError(INVALID_CSV_MESSAGE)
+
+def parse_sci_spinner_rows(rows, column_indices):
+    time_in_seconds, x, y, z = (parse_float_column([row[i] for row in rows]) for i in column_indices)
+    return time_in_seconds / 3600, x / STANDARD_GRAVITY, y / STANDARD_GRAVITY, z / STANDARD_GRAVITY
+
+def read_sci_spinner_csv(file_path):
+    with open(file_path, 'r') as file:
+        csv_reader = csv.reader(file)
+        header = next(csv_reader, [])
+        rows = [row for row in csv_reader if row]
+
+    column_indices = find_sci_spinner_columns(header)
+    return AccelerometerData(*parse_sci_spinner_rows(rows, column_indices), "sci_spinner")
+
+def report_position(file, file_size, report):
+    # the csv reader disables tell() on the text file, so progress is read from the bytes buffered beneath it
+    if report is not None:
+        report(file.buffer.tell() / max(file_size, 1))
+
+def iterate_sci_spinner_csv(file_path, chunk_rows, report=None):
+    file_size = os.path.getsize(file_path)
+    with open(file_path, 'r') as file:
+        csv_reader = csv.reader(file)
+        column_indices = find_sci_spinner_columns(next(csv_reader, []))
+        while True:
+            batch = list(islice(csv_reader, chunk_rows))
+            if not batch:
+                break
+            rows = [row for row in batch if row]
+            report_position(file, file_size, report)
+            if rows:
+                yield parse_sci_spinner_rows(rows, column_indices)
+
+def iterate_timestamp_csv(file_path, chunk_bytes=DEFAULT_CHUNK_BYTES, report=None):
+    file_size = os.path.getsize(file_path)
+    origin = None
+    partial_token = ""
+    carried_tokens = []
+    with open(file_path, 'r') as file:
+        while True:
+            text = file.read(chunk_bytes)
+            if text and not text.endswith('\n'):
+                text += file.readline()
+            # the last piece of a chunk may continue into the next one, so it is held back
+            pieces = tokenize_timestamp_csv(text)
+            pieces[0] = partial_token + pieces[0]
+            if text:
+                partial_token = pieces.pop()
+
+            report_position(file, file_size, report)
+            tokens = carried_tokens + pieces
+            num_rows = len(tokens) // TOKENS_PER_ROW
+            carried_tokens = tokens[num_rows * TOKENS_PER_ROW:]
+            if num_rows:
+                timestamps, x, y, z = parse_timestamp_rows(tokens)
+                if origin is None:
+                    origin = timestamps[0]
+                yield hours_since(timestamps, origin), x, y, z
+            if not text:
+                break
+
+def parse_timestamps_rowwise(first, second):
+    timestamps = np.empty(len(first), dtype='datetime64[us]')
+    for i, (first_token, second_token) in enumerate(zip(first, second)):
+        try:
+            dt = parser.parse(first_token + " " + second_token)
+        except ValueError:
+            dt = parser.parse(second_token + " " + first_token)
+        timestamps[i] = to_datetime64(dt)
+    return timestamps
+
+def to_datetime64(dt, unit='us'):
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(dt, unit)
+
+def parse_iso_times(times):
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        midnight = np.datetime64("1970-01-01T00:00", 'us')
+        return np.array(["1970-01-01T" + time for time in times], dtype='datetime64[us]') - midnight
+
+def parse_fixed_width_times(times):
+    encoded = np.array(times, dtype='S')
+    width = encoded.dtype.itemsize
+    if width not in (5, 8) and not 10 <= width <= 15:
+        return None
+
+    chars = encoded.view(np.uint8).reshape(-1, width)
+    separators = {2: ord(":"), 5: ord(":"), 8: ord(".")}
+    digit_columns = [i for i in range(width) if i not in separators]
+    if any((chars[:, i] != code).any() for i, code in separators.items() if i < width):
+        return None
+    digits = chars[:, digit_columns].astype(np.int64) - ord("0")
+    if ((digits < 0) | (digits > 9)).any():
+        return None
+
+    hours = digits[:, 0] * 10 + digits[:, 1]
+    minutes = digits[:, 2] * 10 + digits[:, 3]
+    seconds = digits[:, 4] * 10 + digits[:, 5] if width >= 8 else 0
+    if (hours > 23).any() or (minutes > 59).any() or np.any(seconds > 59):
+        return None
+
+    microseconds = np.zeros(len(encoded), dtype=np.int64)
+    for place, column in enumerate(range(6, digits.shape[1])):
+        microseconds += digits[:, column] * 10 ** (5 - place)
+    return ((hours * 60 + minutes) * 60 + seconds) * 1000000 + microseconds
+
+def parse_dates(dates):
+    unique_dates = dict.fromkeys(dates)
+    # parse each distinct date once; a log only spans a handful of days
+    for date in unique_dates:
+        unique_dates[date] = to_datetime64(parser.parse(date), 'D').astype('datetime64[us]')
+    if len(unique_dates) == 1:
+        return next(iter(unique_dates.values()))
+    return np.array([unique_dates[date] for date in dates], dtype='datetime64[us]')
+
+def parse_date_runs(dates):
+    run_starts = np.flatnonzero(np.concatenate(([True], dates[1:] != dates[:-1])))
+    run_dates = parse_dates([date.decode() for date in dates[run_starts]])
+    if run_starts.size == 1:
+        return run_dates
+    return np.repeat(run_dates, np.diff(np.append(run_starts, dates.size)))
+
+def detect_timestamp_layout(first_token, second_token):
+    if ISO_TIME_PATTERN.match(second_token) and ":" not in first_token:
+        return "date_time"
+    if ISO_TIME_PATTERN.match(first_token) and ":" not in second_token:
+        return "time_date"
+    return None
+
+def parse_timestamp_columns(first, second):
+    if len(first) == 0:
+        return np.empty(0, dtype='datetime64[us]')
+
+    layout = detect_timestamp_layout(first[0], second[0])
+    if layout is not None:
+        dates, times = (first, second) if layout == "date_time" else (second, first)
+        try:
+            time_of_day = parse_fixed_width_times(times)
+            time_of_day = parse_iso_times(times) if time_of_day is None else time_of_day.astype('timedelta64[us]')
+            return parse_dates(dates) + time_of_day
+        except (ValueError, OverflowError, Warning):
+            pass
+
+    return parse_timestamps_rowwise(first, second)
+
+def parse_float_column(column):
+    return np.array(column, dtype=float)
+
+def parse_timestamp_rows(tokens):
+    num_rows = len(tokens) // TOKENS_PER_ROW
+    columns = [tokens[i:num_rows * TOKENS_PER_ROW:TOKENS_PER_ROW] for i in range(TOKENS_PER_ROW)]
+
+    timestamps = parse_timestamp_columns(columns[0], columns[1])
+    x, y, z = (parse_float_column(column) for column in columns[2:])
+    return timestamps, x, y, z
+
+def hours_since(timestamps, origin):
+    return (timestamps - origin) / np.timedelta64(1, 'us') / 3.6e9
+
+def parse_timestamp_tokens(tokens):
+    timestamps, x, y, z = parse_timestamp_rows(tokens)
+    if len(timestamps) == 0:
+        return np.empty(0), x, y, z
+    return hours_since(timestamps, timestamps[0]), x, y, z
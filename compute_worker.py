@@ -0,0 +1,501 @@
+import itertools
+import multiprocessing
+import queue
+import threading
+from multiprocessing import shared_memory
+from time import monotonic
+import numpy as np
+from accelerometer_data import INVALID_CSV_MESSAGE
+from convergence import find_convergence
+from fibonacci_lattice import CoverageTracker, getLatticeGeometry
+from math_model import MathModel, TimeAveragedGravity
+from recording import AccelerometerRecording, RecordingWriter, recording_path_for
+from result_cache import DiskCache, ResultCache, fingerprint
+from streaming import AccelerometerStreamingAnalysis
+from time_index import TimeIndex
+
+WORKER_STOP_TIMEOUT = 2.0
+PROGRESS_BLOCK_SAMPLES = 65536
+THEORETICAL_STAGES = ("Simulating rotation", "Averaging acceleration", "Scoring distribution", "Scoring analysis period")
+CONVERGENCE_STAGES = ("Checking convergence",) + THEORETICAL_STAGES
+INGEST_STAGES = ("Reading CSV file", "Saving recording")
+STREAM_REFRESH_SECONDS = 1.0
+
+class JobCancelled(Exception):
+    pass
+
+class ComputeJob:
+    def __init__(self, function, *args, stages=()):
+        self.function = function
+        self.args = args
+        self.stages = tuple(stages)
+        self.stage = None
+        self.stage_index = 0
+        self.stage_fraction = 0.0
+        self.status = "pending"
+        self.result = None
+        self.error = None
+        self.preview = None
+        self.cancel_event = threading.Event()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def start(self):
+        self.status = "running"
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+        return self
+
+    def run(self):
+        try:
+            self.result = self.function(self, *self.args)
+            self.status = "done"
+        except JobCancelled:
+            self.status = "cancelled"
+        except Exception as e:
+            self.error = e
+            self.status = "failed"
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def is_cancelled(self):
+        return self.cancel_event.is_set()
+
+    def check_cancelled(self):
+        if self.cancel_event.is_set():
+            raise JobCancelled()
+
+    def enter_stage(self, stage):
+        self.check_cancelled()
+        with self.lock:
+            self.stage = stage
+            self.stage_index = self.stages.index(stage) if stage in self.stages else self.stage_index
+            self.stage_fraction = 0.0
+
+    def report(self, fraction):
+        self.check_cancelled()
+        with self.lock:
+            self.stage_fraction = min(max(fraction, 0.0), 1.0)
+
+    def publish(self, preview):
+        with self.lock:
+            self.preview = preview
+
+    def take_preview(self):
+        with self.lock:
+            preview, self.preview = self.preview, None
+        return preview
+
+    def progress(self):
+        with self.lock:
+            if not self.stages:
+                return self.stage, 0.0
+            return self.stage, (self.stage_index + self.stage_fraction) / len(self.stages)
+
+    def is_finished(self):
+        return self.status in ("done", "cancelled", "failed")
+
+def no_progress(fraction):
+    pass
+
+def calculate_acceleration_blocks(model, time_array, report=no_progress):
+    # samples are independent, so block-wise evaluation gives the same arrays while reporting between blocks
+    a_array = np.empty((3, time_array.size))
+    a_tot_array = np.empty((3, time_array.size))
+    for start in range(0, time_array.size, PROGRESS_BLOCK_SAMPLES):
+        stop = min(start + PROGRESS_BLOCK_SAMPLES, time_array.size)
+        _, _, a_array[:, start:stop], a_tot_array[:, start:stop] = model.calculate_acceleration_at(time_array[start:stop])
+        report(stop / time_array.size)
+    return a_array, a_tot_array
+
+def theoretical_model_data(result_cache, outer_rpm, inner_rpm, theta_1_init, theta_2_init, delta_x, delta_y, delta_z, duration_hours, sample_interval, report=no_progress):
+    def compute():
+        theoretical_model = MathModel(outer_rpm, inner_rpm, theta_1_init, theta_2_init, delta_x, delta_y, delta_z, duration_hours, sample_interval)
+        time_array = theoretical_model.calculate_time_array()
+        period_samples = theoretical_model.period_samples()
+
+        if period_samples is None:
+            a_array, a_tot_array = calculate_acceleration_blocks(theoretical_model, time_array, report)
+            a_avg = np.cumsum(a_array, axis=1) / np.arange(1, a_array.shape[1] + 1)
+        else:
+            period_time = np.arange(period_samples) * theoretical_model.time_step()
+            a_array, a_tot_array = calculate_acceleration_blocks(theoretical_model, period_time, report)
+            a_avg = MathModel.extend_running_average(a_array, len(time_array))
+        return time_array, a_avg, a_tot_array
+
+    key = theoretical_model_key(outer_rpm, inner_rpm, theta_1_init, theta_2_init, delta_x, delta_y, delta_z, duration_hours, sample_interval)
+    return result_cache.get_or_compute(key, compute, persist=True)
+
+def theoretical_model_key(outer_rpm, inner_rpm, theta_1_init, theta_2_init, delta_x, delta_y, delta_z, duration_hours, sample_interval):
+    return ("theoretical_model", outer_rpm, inner_rpm, theta_1_init, theta_2_init, delta_x, delta_y, delta_z, duration_hours, sample_interval)
+
+def track_coverage(coverage_tracker, x, y, z, report=no_progress):
+    for start in range(0, len(x), PROGRESS_BLOCK_SAMPLES):
+        stop = min(start + PROGRESS_BLOCK_SAMPLES, len(x))
+        coverage_tracker.update(x[start:stop], y[start:stop], z[start:stop])
+        report(stop / len(x))
+    return coverage_tracker
+
+def distribution_score(result_cache, ID, x, y, z, report=no_progress):
+    # the tracker counts the same visited cells as FibonacciLattice.getDistribution, a block at a time
+    key = ("distribution", fingerprint(x, y, z))
+    score, = result_cache.get_or_compute(key, lambda: (track_coverage(CoverageTracker(ID), x, y, z, report).getDistribution(),), persist=True)
+    return int(score)
+
+def coverage_by_frame(result_cache, x, y, z, report=no_progress):
+    def compute():
+        coverage_tracker = track_coverage(CoverageTracker("animated"), x, y, z, report)
+        return coverage_tracker.getCoverageAt(np.arange(len(x) + 1) - 1),
+
+    key = ("coverage_by_frame", fingerprint(x, y, z))
+    coverage, = result_cache.get_or_compute(key, compute, persist=True)
+    return coverage
+
+def theoretical_model_args(params):
+    return (params["outer_rpm"], params["inner_rpm"], params["theta_1_init"], params["theta_2_init"],
+            params["delta_x"], params["delta_y"], params["delta_z"], params["duration_hours"], params["sample_interval"])
+
+def converged_duration(job, params):
+    # the run is cut short an hour after the time-averaged gravity settles, but never before the analysis period ends
+    convergence = find_convergence(MathModel(*theoretical_model_args(params)), report=job.report)
+    if not convergence["stopped_early"]:
+        return None, None
+    return convergence["convergence_time"], max(convergence["end_time"], params["end_analysis"] or 0.0)
+
+def compute_theoretical_results(job, result_cache, params):
+    converged_at = None
+    if params["stop_at_convergence"]:
+        job.enter_stage("Checking convergence")
+        converged_at, duration_hours = converged_duration(job, params)
+        if converged_at is not None:
+            params = dict(params, duration_hours=duration_hours)
+
+    job.enter_stage("Simulating rotation")
+    model_args = theoretical_model_args(params)
+    time_array, a_avg, a_tot_array = theoretical_model_data(result_cache, *model_args, report=job.report)
+
+    theoretical_model = MathModel(*model_args)
+    sample_step = theoretical_model.time_step()
+    sample_error = theoretical_model.estimate_sample_error(sample_step)
+    sample_tolerance = theoretical_model.tolerance
+
+    job.enter_stage("Averaging acceleration")
+    g_x_avg, g_y_avg, g_z_avg, g_magnitude = TimeAveragedGravity(*model_args[:4]).evaluate(time_array)
+    a_x_avg, a_y_avg, a_z_avg = a_avg
+    a_magnitude = np.sqrt(a_x_avg**2 + a_y_avg**2 + a_z_avg**2)
+    has_window = params["start_analysis"] is not None and params["end_analysis"] is not None
+    analysis_window = None
+    avg_g_magnitude_analysis = None
+    avg_a_magnitude_analysis = None
+    if has_window:
+        time_index = TimeIndex(time_array / 3600, g_magnitude=g_magnitude, a_magnitude=a_magnitude)
+        analysis_window = time_index.window(params["start_analysis"], params["end_analysis"])
+        avg_g_magnitude_analysis = time_index.mean_between("g_magnitude", *analysis_window)
+        avg_a_magnitude_analysis = time_index.mean_between("a_magnitude", *analysis_window)
+
+    job.enter_stage("Scoring distribution")
+    score = distribution_score(result_cache, "theoretical", a_tot_array[0], a_tot_array[1], a_tot_array[2], report=job.report)
+
+    window_path = None
+    window_coverage_by_frame = None
+    if has_window:
+        job.enter_stage("Scoring analysis period")
+        window_path = MathModel.take_periodic(a_tot_array, *analysis_window)
+        window_coverage_by_frame = coverage_by_frame(result_cache, *window_path, report=job.report)
+
+    job.check_cancelled()
+    return {
+        "time_array": time_array,
+        "converged_at": converged_at,
+        "duration_hours": params["duration_hours"],
+        "sample_step": sample_step,
+        "sample_error": sample_error,
+        "sample_tolerance": sample_tolerance,
+        "analysis_window": analysis_window,
+        "g_avg": (g_x_avg, g_y_avg, g_z_avg),
+        "g_magnitude": g_magnitude,
+        "avg_g_magnitude": np.mean(g_magnitude),
+        "avg_g_magnitude_analysis": avg_g_magnitude_analysis,
+        "a_avg": (a_x_avg, a_y_avg, a_z_avg),
+        "a_magnitude": a_magnitude,
+        "avg_a_magnitude": np.mean(a_magnitude),
+        "avg_a_magnitude_analysis": avg_a_magnitude_analysis,
+        "a_tot_array": a_tot_array,
+        "distribution_score": score,
+        "window_path": window_path,
+        "window_coverage_by_frame": window_coverage_by_frame,
+    }
+
+def cache_theoretical_results(result_cache, params, results):
+    # results from the worker process are views into shared memory that is handed back later, so the cache keeps copies
+    params = dict(params, duration_hours=results["duration_hours"])
+    entries = [(theoretical_model_key(*theoretical_model_args(params)), lambda: tuple(np.array(results[name]) for name in ("time_array", "a_avg", "a_tot_array"))),
+               (("distribution", fingerprint(*results["a_tot_array"])), lambda: (results["distribution_score"],))]
+    if results["window_path"] is not None:
+        entries.append((("coverage_by_frame", fingerprint(*results["window_path"])), lambda: (np.array(results["window_coverage_by_frame"]),)))
+    for key, copy in entries:
+        if key not in result_cache:
+            result_cache.put(key, copy())
+
+class SharedArray:
+    def __init__(self, name, shape, dtype):
+        self.name = name
+        self.shape = shape
+        self.dtype = dtype
+
+def create_recording_writer(experimental_file):
+    try:
+        return RecordingWriter(recording_path_for(experimental_file.file_path), experimental_file.source_format)
+    except OSError:
+        return None
+
+def append_to_recording(recording_writer, time_block, x, y, z):
+    if recording_writer is None:
+        return None
+    try:
+        recording_writer.append(time_block, x, y, z)
+        return recording_writer
+    except OSError:
+        # a full disk only costs the copy; the analysis carries on from the CSV
+        recording_writer.abort()
+        return None
+
+def close_recording_writer(recording_writer, result):
+    if recording_writer is None:
+        return None
+    try:
+        recording_writer.close(result)
+        return AccelerometerRecording(recording_writer.path)
+    except (OSError, ValueError, KeyError):
+        recording_writer.abort()
+        return None
+
+def abort_recording(recording_writer):
+    if recording_writer is not None:
+        recording_writer.abort()
+
+def ingest_experimental_file(job, experimental_file, start_analysis, end_analysis):
+    job.enter_stage("Reading CSV file")
+    analysis = AccelerometerStreamingAnalysis("experimental", start_analysis, end_analysis)
+    recording_writer = create_recording_writer(experimental_file)
+    last_refresh = monotonic()
+    try:
+        for time_block, x, y, z in experimental_file.iterate_chunks(job.report):
+            analysis.update(time_block, x, y, z)
+            recording_writer = append_to_recording(recording_writer, time_block, x, y, z)
+            if monotonic() - last_refresh >= STREAM_REFRESH_SECONDS:
+                job.publish(analysis.result())
+                last_refresh = monotonic()
+        job.enter_stage("Saving recording")
+    except ValueError:
+        abort_recording(recording_writer)
+        raise ValueError(INVALID_CSV_MESSAGE)
+    except BaseException:
+        abort_recording(recording_writer)
+        raise
+
+    # the streamed summary is the result; the recording only serves later Starts and the full-resolution exports
+    result = analysis.result()
+    result["recording"] = close_recording_writer(recording_writer, result)
+    return result
+
+def publish_arrays(value, blocks):
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        block = shared_memory.SharedMemory(create=True, size=max(1, value.nbytes))
+        np.ndarray(value.shape, dtype=value.dtype, buffer=block.buf)[...] = value
+        blocks[block.name] = block
+        return SharedArray(block.name, value.shape, value.dtype.str)
+    if isinstance(value, tuple):
+        return tuple(publish_arrays(item, blocks) for item in value)
+    if isinstance(value, dict):
+        return {name: publish_arrays(item, blocks) for name, item in value.items()}
+    return value
+
+def attach_arrays(value, handles):
+    if isinstance(value, SharedArray):
+        block = shared_memory.SharedMemory(name=value.name)
+        handles.append(block)
+        array = np.ndarray(value.shape, dtype=np.dtype(value.dtype), buffer=block.buf)
+        array.flags.writeable = False
+        return array
+    if isinstance(value, tuple):
+        return tuple(attach_arrays(item, handles) for item in value)
+    if isinstance(value, dict):
+        return {name: attach_arrays(item, handles) for name, item in value.items()}
+    return value
+
+class WorkerJob:
+    def __init__(self, job_id, stages, responses, cancels, cancelled_jobs):
+        self.job_id = job_id
+        self.stages = stages
+        self.responses = responses
+        self.cancels = cancels
+        self.cancelled_jobs = cancelled_jobs
+        self.stage = None
+
+    def check_cancelled(self):
+        while True:
+            try:
+                self.cancelled_jobs.add(self.cancels.get_nowait())
+            except queue.Empty:
+                break
+        if self.job_id in self.cancelled_jobs:
+            raise JobCancelled()
+
+    def enter_stage(self, stage):
+        self.check_cancelled()
+        self.stage = stage
+        self.responses.put(("progress", self.job_id, stage, self.stages.index(stage) / len(self.stages)))
+
+    def report(self, fraction):
+        self.check_cancelled()
+        fraction = min(max(fraction, 0.0), 1.0)
+        self.responses.put(("progress", self.job_id, self.stage, (self.stages.index(self.stage) + fraction) / len(self.stages)))
+
+def release_blocks(blocks, names):
+    for name in names:
+        block = blocks.pop(name, None)
+        if block is not None:
+            block.close()
+            block.unlink()
+
+def worker_main(requests, responses, cancels, cache_version, num_points):
+    try:
+        disk_cache = DiskCache(version=cache_version)
+    except OSError:
+        disk_cache = None
+    result_cache = ResultCache(disk_cache=disk_cache)
+    getLatticeGeometry(num_points)
+    # blocks stay open here until the GUI has attached to them and sends them back
+    published = {}
+    cancelled_jobs = set()
+    try:
+        while True:
+            message = requests.get()
+            if message[0] == "stop":
+                break
+            if message[0] == "release":
+                release_blocks(published, message[1])
+                continue
+
+            _, job_id, function, stages, params = message
+            job = WorkerJob(job_id, stages, responses, cancels, cancelled_jobs)
+            try:
+                result = publish_arrays(function(job, result_cache, params), published)
+                responses.put(("done", job_id, result))
+            except JobCancelled:
+                responses.put(("cancelled", job_id))
+            except Exception as e:
+                responses.put(("failed", job_id, str(e)))
+            cancelled_jobs.discard(job_id)
+    finally:
+        release_blocks(published, list(published))
+
+class ProcessJob:
+    def __init__(self, worker, job_id, stages):
+        self.worker = worker
+        self.job_id = job_id
+        self.stages = tuple(stages)
+        self.stage = None
+        self.fraction = 0.0
+        self.status = "running"
+        self.result = None
+        self.error = None
+        self.handles = []
+
+    def cancel(self):
+        self.worker.cancel(self.job_id)
+
+    def progress(self):
+        self.worker.poll()
+        return self.stage, self.fraction
+
+    def is_finished(self):
+        self.worker.poll()
+        return self.status in ("done", "cancelled", "failed")
+
+    def handle(self, message):
+        kind = message[0]
+        if kind == "progress":
+            self.stage, self.fraction = message[2], message[3]
+        elif kind == "done":
+            self.result = attach_arrays(message[2], self.handles)
+            self.status = "done"
+            if self.job_id in self.worker.cancelled_jobs:
+                self.release()
+                self.status = "cancelled"
+        elif kind == "cancelled":
+            self.status = "cancelled"
+        elif kind == "failed":
+            self.error = RuntimeError(message[2])
+            self.status = "failed"
+
+    def release(self):
+        names = [handle.name for handle in self.handles]
+        for handle in self.handles:
+            try:
+                handle.close()
+            except BufferError:
+                # still viewed by artists awaiting garbage collection; the mapping goes away with them
+                pass
+        self.handles = []
+        self.result = None
+        self.worker.release(names)
+
+class ComputeProcess:
+    def __init__(self, cache_version=0, num_points=1000):
+        context = multiprocessing.get_context("spawn")
+        self.requests = context.Queue()
+        self.responses = context.Queue()
+        # cancellations get their own queue, since the worker reads it mid-job while requests wait for the next one
+        self.cancels = context.Queue()
+        self.cancelled_jobs = set()
+        self.process = context.Process(target=worker_main, args=(self.requests, self.responses, self.cancels, cache_version, num_points), daemon=True)
+        self.process.start()
+        self.job_ids = itertools.count()
+        self.jobs = {}
+
+    def submit(self, function, params, stages=()):
+        if not self.process.is_alive():
+            raise RuntimeError("The compute process has stopped.")
+        job = ProcessJob(self, next(self.job_ids), stages)
+        self.jobs[job.job_id] = job
+        self.requests.put(("run", job.job_id, function, job.stages, params))
+        return job
+
+    def cancel(self, job_id):
+        self.cancelled_jobs.add(job_id)
+        if self.process.is_alive():
+            self.cancels.put(job_id)
+
+    def poll(self):
+        while True:
+            try:
+                message = self.responses.get_nowait()
+            except queue.Empty:
+                break
+            job = self.jobs.get(message[1])
+            if job is None:
+                continue
+            job.handle(message)
+            if job.status != "running":
+                del self.jobs[job.job_id]
+                self.cancelled_jobs.discard(job.job_id)
+
+        if not self.process.is_alive():
+            for job in self.jobs.values():
+                job.error = RuntimeError("The compute process has stopped.")
+                job.status = "failed"
+            self.jobs.clear()
+
+    def release(self, names):
+        if names and self.process.is_alive():
+            self.requests.put(("release", names))
+
+    def close(self):
+        if self.process.is_alive():
+            self.requests.put(("stop",))
+            self.process.join(WORKER_STOP_TIMEOUT)
+        if self.process.is_alive():
+            self.process.terminate()
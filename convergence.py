@@ -0,0 +1,147 @@
+import math as m
+import numpy as np
+from math_model import BYTES_PER_SAMPLE, DEFAULT_BLOCK_BYTES
+
+DEFAULT_CONVERGENCE_THRESHOLD = 1e-3
+DEFAULT_HOLD_HOURS = 1.0
+CHECKS_PER_HOLD = 4
+
+def vector_magnitude(vectors):
+    return np.sqrt(vectors[0]**2 + vectors[1]**2 + vectors[2]**2)
+
+def expanding_magnitude(x, y, z):
+    counts = np.arange(1, len(x) + 1)
+    return vector_magnitude(np.cumsum(np.vstack((x, y, z)), axis=1) / counts)
+
+def rolling_magnitude(x, y, z, window_samples):
+    prefix_sums = np.hstack((np.zeros((3, 1)), np.cumsum(np.vstack((x, y, z)), axis=1)))
+    ends = np.arange(1, len(x) + 1)
+    starts = np.maximum(ends - window_samples, 0)
+    return vector_magnitude((prefix_sums[:, ends] - prefix_sums[:, starts]) / (ends - starts))
+
+def below_threshold_intervals(time_in_hours, magnitude, threshold=DEFAULT_CONVERGENCE_THRESHOLD):
+    below = np.asarray(magnitude) < threshold
+    edges = np.diff(below.astype(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    stops = np.flatnonzero(edges == -1) - 1
+    return np.column_stack((time_in_hours[starts], time_in_hours[stops])) if starts.size else np.empty((0, 2))
+
+def convergence_time(time_in_hours, magnitude, threshold=DEFAULT_CONVERGENCE_THRESHOLD):
+    magnitude = np.asarray(magnitude)
+    if magnitude.size == 0 or magnitude[-1] >= threshold:
+        return None
+    above = np.flatnonzero(magnitude >= threshold)
+    return float(time_in_hours[above[-1] + 1 if above.size else 0])
+
+class ConvergenceTracker:
+    def __init__(self, threshold=DEFAULT_CONVERGENCE_THRESHOLD, window_samples=None, use_rolling=False):
+        if use_rolling and window_samples is None:
+            raise ValueError("A rolling window is required for rolling convergence.")
+        self.threshold = threshold
+        self.window_samples = window_samples
+        self.use_rolling = use_rolling
+        self.num_samples = 0
+        self.running_sum = np.zeros(3)
+        self.tail = np.empty((3, 0))
+        self.interval_starts = []
+        self.interval_stops = []
+        self.below_since = None
+        self.first_below_time = None
+        self.last_time = None
+        self.last_magnitude = np.nan
+        self.last_below_time = None
+
+    def update(self, time_block, g_block):
+        num_new = len(time_block)
+        if num_new == 0:
+            return np.empty(0), np.empty(0)
+
+        cumulative = np.cumsum(g_block, axis=1) + self.running_sum[:, None]
+        expanding = vector_magnitude(cumulative / np.arange(self.num_samples + 1, self.num_samples + num_new + 1))
+
+        rolling = np.empty(0)
+        if self.window_samples is not None:
+            # the previous block's last window_samples samples seed the windows that straddle the block boundary
+            combined = np.hstack((self.tail, g_block))
+            prefix_sums = np.hstack((np.zeros((3, 1)), np.cumsum(combined, axis=1)))
+            ends = np.arange(self.tail.shape[1] + 1, combined.shape[1] + 1)
+            starts = np.maximum(ends - self.window_samples, 0)
+            rolling = vector_magnitude((prefix_sums[:, ends] - prefix_sums[:, starts]) / (ends - starts))
+            self.tail = combined[:, -self.window_samples:]
+
+        self.track_intervals(time_block, rolling if self.use_rolling else expanding)
+        self.running_sum = cumulative[:, -1]
+        self.num_samples += num_new
+        self.last_time = time_block[-1]
+        return expanding, rolling
+
+    def track_intervals(self, time_block, magnitude):
+        below = magnitude < self.threshold
+        was_below = self.below_since is not None
+        changes = np.flatnonzero(np.diff(below.astype(np.int8), prepend=np.int8(was_below)))
+        starts = time_block[changes[below[changes]]]
+        # a run ends at the last sample below the threshold, the one before the crossing back up
+        stop_indices = changes[~below[changes]] - 1
+        stops = np.where(stop_indices >= 0, time_block[np.maximum(stop_indices, 0)], self.last_below_time if self.last_below_time is not None else np.nan)
+
+        if was_below:
+            starts = np.concatenate(([self.below_since], starts))
+        if len(starts) > len(stops):
+            self.below_since = starts[-1]
+            starts = starts[:-1]
+        else:
+            self.below_since = None
+        self.interval_starts.append(starts)
+        self.interval_stops.append(stops)
+
+        if below.any():
+            if self.first_below_time is None:
+                self.first_below_time = time_block[np.argmax(below)]
+            self.last_below_time = time_block[len(below) - 1 - np.argmax(below[::-1])]
+        self.last_magnitude = magnitude[-1]
+
+    def has_converged(self, hold_hours=DEFAULT_HOLD_HOURS):
+        return self.below_since is not None and self.last_time - self.below_since >= hold_hours
+
+    def result(self):
+        starts = np.concatenate(self.interval_starts) if self.interval_starts else np.empty(0)
+        stops = np.concatenate(self.interval_stops) if self.interval_stops else np.empty(0)
+        if self.below_since is not None:
+            starts = np.append(starts, self.below_since)
+            stops = np.append(stops, self.last_time)
+        return {
+            "threshold": self.threshold,
+            "num_samples": self.num_samples,
+            "end_time": float(self.last_time) if self.last_time is not None else None,
+            "convergence_time": float(self.below_since) if self.below_since is not None else None,
+            "first_below_time": float(self.first_below_time) if self.first_below_time is not None else None,
+            "intervals": np.column_stack((starts, stops)),
+            "final_magnitude": float(self.last_magnitude),
+        }
+
+def hold_block_size(model, hold_hours=DEFAULT_HOLD_HOURS, max_block_bytes=DEFAULT_BLOCK_BYTES):
+    # convergence is only checked between blocks, so a block spans a fraction of the hold window and the run stops soon after it holds
+    max_block_size = max(1, max_block_bytes // BYTES_PER_SAMPLE)
+    time_step = model.time_step()
+    if time_step <= 0:
+        return max_block_size
+    return max(1, min(m.ceil(hold_hours * 3600 / time_step / CHECKS_PER_HOLD), max_block_size))
+
+def find_convergence(model, threshold=DEFAULT_CONVERGENCE_THRESHOLD, hold_hours=DEFAULT_HOLD_HOURS, window_samples=None,
+                     use_rolling=False, block_size=None, max_block_bytes=DEFAULT_BLOCK_BYTES, report=None):
+    if block_size is None:
+        block_size = hold_block_size(model, hold_hours, max_block_bytes)
+    tracker = ConvergenceTracker(threshold, window_samples, use_rolling)
+    num_samples = model.num_samples()
+    stopped_early = False
+    for time_block, g_block, _, _ in model.iterate_acceleration(block_size, max_block_bytes, reuse_buffers=True):
+        tracker.update(time_block / 3600, g_block)
+        if report is not None:
+            report(tracker.num_samples / num_samples)
+        if tracker.has_converged(hold_hours):
+            stopped_early = tracker.num_samples < num_samples
+            break
+
+    report = tracker.result()
+    report["stopped_early"] = stopped_early
+    return report
@@ -0,0 +1,100 @@
+import copy
+import numpy as np
+
+DEFAULT_PIXEL_WIDTH = 1000
+DEFAULT_PYRAMID_BASE_BIN = 8
+DEFAULT_LEVEL_CHUNK_BINS = 1 << 16
+
+def ordered_pairs(min_columns, max_columns):
+    # each bin keeps its minimum and maximum in sample order, so a run of bins flattens into a sorted line
+    swap = (min_columns[0] > max_columns[0])[:, None]
+    return [np.where(swap, np.column_stack((high, low)), np.column_stack((low, high))) for low, high in zip(min_columns, max_columns)]
+
+def min_max_levels(x, y, base_bin_size=DEFAULT_PYRAMID_BASE_BIN, chunk_bins=DEFAULT_LEVEL_CHUNK_BINS):
+    num_samples = len(y)
+    if num_samples <= base_bin_size:
+        return []
+
+    # the finest level is binned a chunk at a time, so a memory-mapped column is read once without being loaded whole
+    minima, maxima = [[], [], []], [[], [], []]
+    chunk_size = base_bin_size * chunk_bins
+    for start in range(0, num_samples, chunk_size):
+        block = np.asarray(y[start:start + chunk_size])
+        x_block = np.asarray(x[start:start + chunk_size], dtype=float)
+        padding = -len(block) % base_bin_size
+        bins = np.concatenate((block, np.full(padding, block[-1]))).reshape(-1, base_bin_size)
+        rows = np.arange(len(bins))
+        offsets = rows * base_bin_size
+        for stored, columns in ((minima, np.argmin(bins, axis=1)), (maxima, np.argmax(bins, axis=1))):
+            positions = np.minimum(offsets + columns, len(block) - 1)
+            stored[0].append(start + positions)
+            stored[1].append(x_block[positions])
+            stored[2].append(bins[rows, columns])
+    minima = [np.concatenate(column) for column in minima]
+    maxima = [np.concatenate(column) for column in maxima]
+
+    levels = []
+    bin_size = base_bin_size
+    # each level pairs up the bins below it, so the whole pyramid costs about one pass over the data
+    while True:
+        levels.append((bin_size, *ordered_pairs(minima, maxima)))
+        if len(minima[0]) == 1:
+            break
+        if len(minima[0]) % 2:
+            minima = [np.append(column, column[-1]) for column in minima]
+            maxima = [np.append(column, column[-1]) for column in maxima]
+        rows = np.arange(len(minima[0]) // 2)
+        min_choice = np.argmin(minima[2].reshape(-1, 2), axis=1)
+        max_choice = np.argmax(maxima[2].reshape(-1, 2), axis=1)
+        minima = [column.reshape(-1, 2)[rows, min_choice] for column in minima]
+        maxima = [column.reshape(-1, 2)[rows, max_choice] for column in maxima]
+        bin_size *= 2
+    return levels
+
+class MinMaxPyramid:
+    def __init__(self, x, y, base_bin_size=DEFAULT_PYRAMID_BASE_BIN, levels=None, search_x=None):
+        self.x = x
+        self.y = y
+        self.num_samples = len(y)
+        if search_x is None:
+            x = np.asarray(x, dtype=float)
+            # a running maximum is sorted, so view limits can be found by binary search even if the clock steps back
+            search_x = np.maximum.accumulate(x) if x.size else x
+        self.search_x = search_x
+        # a level keeps the x and y of its samples, so a coarse view never reads the series itself
+        self.levels = min_max_levels(x, y, base_bin_size) if levels is None else levels
+        self.first = 0
+        self.last = self.num_samples
+
+    def window(self, start, stop):
+        # a window shares the levels of the whole series and only clips what it returns
+        view = copy.copy(self)
+        view.first, view.last = max(start, 0), min(max(stop, start), self.num_samples)
+        return view
+
+    def data(self):
+        return self.x[self.first:self.last], self.y[self.first:self.last]
+
+    def query(self, x_min, x_max, pixel_width=DEFAULT_PIXEL_WIDTH):
+        x_min, x_max = min(x_min, x_max), max(x_min, x_max)
+        # one sample either side of the view keeps the line running off the edges of the axes
+        start = max(int(np.searchsorted(self.search_x, x_min, side="left")) - 1, self.first)
+        stop = max(min(int(np.searchsorted(self.search_x, x_max, side="right")) + 1, self.last), start)
+        num_bins = max(int(pixel_width), 1)
+        # a view too narrow to fill its pixels from the finest level reads the samples themselves
+        if not self.levels or stop - start <= max(2, self.levels[0][0]) * num_bins:
+            return np.asarray(self.x[start:stop]), np.asarray(self.y[start:stop])
+
+        for bin_size, indices, x_values, y_values in self.levels:
+            if (stop - start) / bin_size <= 2 * num_bins:
+                break
+        first_bin = start // bin_size
+        last_bin = -(-stop // bin_size)
+        indices, x_values, y_values = (values[first_bin:last_bin].ravel() for values in (indices, x_values, y_values))
+        inside = (indices > start) & (indices < stop - 1)
+        indices = np.concatenate(([start], indices[inside], [stop - 1]))
+        x_values = np.concatenate(([self.x[start]], x_values[inside], [self.x[stop - 1]]))
+        y_values = np.concatenate(([self.y[start]], y_values[inside], [self.y[stop - 1]]))
+        # a bin whose minimum and maximum are the same sample holds it twice
+        distinct = np.diff(indices, prepend=-1) > 0
+        return x_values[distinct], y_values[distinct]
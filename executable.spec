@@ -17,8 +17,18 @@ a = Analysis(
         (os.path.join(images_dir, 'MSSF_logo.png'), 'images'),
         (os.path.join(images_dir, 'NASA_logo.png'), 'images'),
 
+        (os.path.join(project_dir, 'accelerometer_data.py'), '.'),
+        (os.path.join(project_dir, 'compute_worker.py'), '.'),
+        (os.path.join(project_dir, 'convergence.py'), '.'),
+        (os.path.join(project_dir, 'decimation.py'), '.'),
         (os.path.join(project_dir, 'fibonacci_lattice.py'), '.'),
+        (os.path.join(project_dir, 'live_acquisition.py'), '.'),
         (os.path.join(project_dir, 'math_model.py'), '.'),
+        (os.path.join(project_dir, 'recording.py'), '.'),
+        (os.path.join(project_dir, 'result_cache.py'), '.'),
+        (os.path.join(project_dir, 'streaming.py'), '.'),
+        (os.path.join(project_dir, 'sweep_runner.py'), '.'),
+        (os.path.join(project_dir, 'time_index.py'), '.'),
 
         (os.path.join(ffmpeg_dir, 'avcodec-61.dll'), 'ffmpeg'),
         (os.path.join(ffmpeg_dir, 'avdevice-61.dll'), 'ffmpeg'),
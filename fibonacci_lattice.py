@@ -1,124 +1,221 @@
+import math as m
+import threading
+import weakref
+from collections import OrderedDict
 import numpy as np
-
-class FibonacciLattice:
-    def __init__(self, ID, x, y, z):
-        self.ID = ID
-
-        self.x = x
-        self.y = y
-        self.z = z
-
-        self.pathCoords = list(zip(self.x, self.y, self.z))
-        self.num_points = 1000
+from scipy.spatial import cKDTree
+
+class CellIndex:
+    def __init__(self):
+        self.keys = np.empty(0, dtype=np.int64)
+        self.ids = np.empty(0, dtype=np.int64)
+        # shared by every lattice of a geometry, which a background job may be scoring while the GUI thread scores another path
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self.keys.size
+
+    def __find(self, keys):
+        positions = np.searchsorted(self.keys, keys)
+        found = positions < self.keys.size
+        found[found] = self.keys[positions[found]] == keys[found]
+        return positions, found
+
+    def getIds(self, keys):
+        with self.lock:
+            positions, found = self.__find(keys)
+
+            if not found.all():
+                newKeys = np.unique(keys[~found])
+                newIds = np.arange(self.keys.size, self.keys.size + newKeys.size)
+                allKeys = np.concatenate((self.keys, newKeys))
+                order = np.argsort(allKeys, kind='stable')
+                self.keys = allKeys[order]
+                self.ids = np.concatenate((self.ids, newIds))[order]
+                positions, found = self.__find(keys)
+
+            return self.ids[positions]
+
+GEOMETRY_CACHE_SIZE = 4
+GEOMETRY_CACHE = OrderedDict()
+LIVE_GEOMETRIES = weakref.WeakValueDictionary()
+GEOMETRY_LOCK = threading.Lock()
+VERTICES_PER_SEGMENT = 3
+
+class LatticeGeometry:
+    def __init__(self, num_points):
+        if num_points < 8 * VERTICES_PER_SEGMENT:
+            raise ValueError(f"The lattice needs at least {8 * VERTICES_PER_SEGMENT} points, got {num_points}.")
+        self.num_points = num_points
+        self.sphereCoords = self.__createSphere()
+        self.octants = self.__splitSphere(self.sphereCoords)
+        self.cellIndex = CellIndex()
 
     def __createSphere(self):
         golden_r = (np.sqrt(5.0) + 1.0) / 2.0
         golden_a = (2.0 - golden_r) * (2.0 * np.pi)
 
-        Xs, Ys, Zs = [], [], []
-        
-        for i in range(self.num_points):
-            ys = 1 - (i / float(self.num_points - 1)) * 2
-            radius = np.sqrt(1 - ys * ys)
+        i = np.arange(self.num_points)
+        ys = 1 - (i / float(self.num_points - 1)) * 2
+        radius = np.sqrt(1 - ys * ys)
 
-            theta = golden_a * i
+        theta = golden_a * i
 
-            xs = np.cos(theta) * radius
-            zs = np.sin(theta) * radius
+        xs = np.cos(theta) * radius
+        zs = np.sin(theta) * radius
 
-            Xs.append(xs)
-            Ys.append(ys)
-            Zs.append(zs)
+        return np.column_stack((xs, ys, zs))
 
-        return(Xs, Ys, Zs)
+    def getOctantCodes(self, coords):
+        return (coords[:, 2] > 0) * 4 + (coords[:, 1] > 0) * 2 + (coords[:, 0] > 0)
 
     def __splitSphere(self, sphereCoords):
-        octants = {'posI':[], 'posII':[], 'posIII':[], 'posIV':[], 'negI':[], 'negII':[], 'negIII':[], 'negIV':[]}
-        
-        for row in sphereCoords:
-            if (row[2] > 0):
-                if (row[1] > 0):
-                    if (row[0] > 0):
-                        octants['posI'].append(row)
-                    else:
-                        octants['posII'].append(row)
-                elif (row[0] > 0):
-                    octants['posIV'].append(row)
-                else: 
-                    octants['posIII'].append(row)
-            else:
-                if (row[1] > 0):
-                    if (row[0] > 0):
-                        octants['negI'].append(row)
-                    else:
-                        octants['negII'].append(row)
-                elif (row[0] > 0):
-                    octants['negIV'].append(row)
-                else:
-                    octants['negIII'].append(row)
-        
+        octantCodes = self.getOctantCodes(sphereCoords)
+        octants = {}
+
+        for code in range(8):
+            vertexIndices = np.flatnonzero(octantCodes == code)
+            if vertexIndices.size < VERTICES_PER_SEGMENT:
+                raise ValueError(f"A lattice of {self.num_points} points leaves an octant with {vertexIndices.size} vertices; "
+                                 f"every octant needs at least {VERTICES_PER_SEGMENT}. Use more points.")
+            octants[code] = (vertexIndices, cKDTree(sphereCoords[vertexIndices]))
+
         return(octants)
 
-    def __getPathOctant(self, pathRow):
-        if (pathRow[2] > 0):
-            if (pathRow[1] > 0):
-                if (pathRow[0] > 0):
-                    return 'posI'
-                else:
-                    return 'posII'
-            elif (pathRow[0] > 0):
-                return 'posIV'
-            else: 
-                return 'posIII'
+    def getSegmentVertices(self, pathCoords):
+        pathOctants = self.getOctantCodes(pathCoords)
+        segmentVertices = np.zeros((len(pathCoords), 3), dtype=np.int64)
+
+        for code, (vertexIndices, tree) in self.octants.items():
+            pathIndices = np.flatnonzero(pathOctants == code)
+            if pathIndices.size == 0:
+                continue
+            _, nearest = tree.query(pathCoords[pathIndices], k=VERTICES_PER_SEGMENT)
+            segmentVertices[pathIndices] = vertexIndices[nearest]
+
+        return(segmentVertices)
+
+    def getCellIds(self, pathCoords):
+        segmentVertices = self.getSegmentVertices(pathCoords)
+        segmentKeys = (segmentVertices[:, 0] * self.num_points + segmentVertices[:, 1]) * self.num_points + segmentVertices[:, 2]
+        return self.cellIndex.getIds(segmentKeys)
+
+def getLatticeGeometry(num_points):
+    with GEOMETRY_LOCK:
+        geometry = LIVE_GEOMETRIES.get(num_points)
+        if geometry is None:
+            geometry = LatticeGeometry(num_points)
+            LIVE_GEOMETRIES[num_points] = geometry
+
+        GEOMETRY_CACHE[num_points] = geometry
+        GEOMETRY_CACHE.move_to_end(num_points)
+        while len(GEOMETRY_CACHE) > GEOMETRY_CACHE_SIZE:
+            GEOMETRY_CACHE.popitem(last=False)
+
+        return geometry
+
+class FibonacciLattice:
+    def __init__(self, ID, x, y, z, num_points=1000):
+        self.ID = ID
+
+        self.x = x
+        self.y = y
+        self.z = z
+
+        self.pathCoords = np.column_stack((np.asarray(x, dtype=float).ravel(), np.asarray(y, dtype=float).ravel(), np.asarray(z, dtype=float).ravel()))
+        self.num_points = num_points
+        self.geometry = getLatticeGeometry(num_points)
+        self.cellIds = None
+
+    def getCellIndex(self):
+        return self.geometry.cellIndex
+
+    def getCellIds(self):
+        if self.cellIds is None:
+            self.cellIds = self.geometry.getCellIds(self.pathCoords)
+        return self.cellIds
+
+    def getHistogram(self):
+        return np.bincount(self.getCellIds(), minlength=len(self.getCellIndex()))
+
+    def getFirstVisits(self):
+        cellIds = self.getCellIds()
+        firstVisits = np.full(len(self.getCellIndex()), cellIds.size, dtype=np.int64)
+        np.minimum.at(firstVisits, cellIds, np.arange(cellIds.size))
+        firstVisits[firstVisits == cellIds.size] = -1
+        return firstVisits
+
+    def getUniformity(self):
+        histogram = self.getHistogram()
+        visits = histogram[histogram > 0]
+        if visits.size < 2:
+            return 1.0 if visits.size == 1 else 0.0
+        probabilities = visits / visits.sum()
+        return float(-(probabilities * np.log(probabilities)).sum() / np.log(visits.size))
+
+    def getDistribution(self):
+        score = np.count_nonzero(self.getHistogram())
+        return score
+
+class CoverageTracker:
+    def __init__(self, ID, num_points=1000):
+        self.ID = ID
+        self.num_points = num_points
+        self.geometry = getLatticeGeometry(num_points)
+        self.histogram = np.zeros(0, dtype=np.int64)
+        self.firstVisits = np.zeros(0, dtype=np.int64)
+        self.firstVisitTimes = np.zeros(0)
+        self.numSamples = 0
+        self.numCovered = 0
+
+    def __grow(self, numCells):
+        if numCells <= self.histogram.size:
+            return
+        extra = numCells - self.histogram.size
+        self.histogram = np.concatenate((self.histogram, np.zeros(extra, dtype=np.int64)))
+        self.firstVisits = np.concatenate((self.firstVisits, np.full(extra, -1, dtype=np.int64)))
+        self.firstVisitTimes = np.concatenate((self.firstVisitTimes, np.full(extra, np.nan)))
+
+    def update(self, x, y, z, times=None):
+        pathCoords = np.column_stack((np.asarray(x, dtype=float).ravel(), np.asarray(y, dtype=float).ravel(), np.asarray(z, dtype=float).ravel()))
+        if len(pathCoords) == 0:
+            return self.numCovered
+
+        cellIds = self.geometry.getCellIds(pathCoords)
+        self.__grow(len(self.geometry.cellIndex))
+        self.histogram += np.bincount(cellIds, minlength=self.histogram.size)
+
+        batchCells, batchFirst = np.unique(cellIds, return_index=True)
+        isNew = self.firstVisits[batchCells] < 0
+        newCells, newFirst = batchCells[isNew], batchFirst[isNew]
+        self.firstVisits[newCells] = self.numSamples + newFirst
+        if times is None:
+            self.firstVisitTimes[newCells] = self.numSamples + newFirst
         else:
-            if (pathRow[1] > 0):
-                if (pathRow[0] > 0):
-                    return 'negI'
-                else:
-                    return 'negII'
-            elif (pathRow[0] > 0):
-                return 'negIV'
-            else:
-                return 'negIII'
-
-    def __getDistanceBetween(self, pathTupleCoords, sphereTupleCoords):
-        pathX, pathY, pathZ = pathTupleCoords
-        sphereX, sphereY, sphereZ = sphereTupleCoords
-
-        diffX = pathX - sphereX
-        diffY = pathY - sphereY
-        diffZ = pathZ - sphereZ
-
-        sumSquares = diffX ** 2 + diffY ** 2 + diffZ ** 2
-        dist = np.sqrt(sumSquares)
-
-        return dist
-
-    def __getDistributionNum(self, sphereCoords):
-        octants = self.__splitSphere(sphereCoords)
-        
-        pathMap = {} 
-        repeatTime = -1
-
-        for pathRow in self.pathCoords:
-            pathOctant = self.__getPathOctant(pathRow)
-            sphereCoordsSplit = octants[pathOctant]
-            distDict = {}
-            repeatTime += 1
-
-            for sphereRow in sphereCoordsSplit:
-                dist = self.__getDistanceBetween(pathRow, sphereRow)
-                distDict[sphereRow] = dist
-                    
-            rankedDist = sorted(distDict.items(), key=lambda x:x[1])
-            segmentVertices = (rankedDist[0][0], rankedDist[1][0], rankedDist[2][0])
-            
-            pathMap[segmentVertices] = pathMap.get(segmentVertices, []) + [repeatTime]
-        
-        return(len(pathMap))
+            self.firstVisitTimes[newCells] = np.asarray(times, dtype=float).ravel()[newFirst]
+
+        self.numSamples += len(pathCoords)
+        self.numCovered += newCells.size
+        return self.numCovered
+
+    def getHistogram(self):
+        return self.histogram
 
     def getDistribution(self):
-        Xsphere, Ysphere, Zsphere = self.__createSphere()
-        sphereCoords = list(zip(Xsphere, Ysphere, Zsphere))
-        score = self.__getDistributionNum(sphereCoords)
-        return score
\ No newline at end of file
+        return self.numCovered
+
+    def getCoverageCurve(self):
+        order = np.argsort(self.firstVisits[self.firstVisits >= 0], kind='stable')
+        times = self.firstVisitTimes[self.firstVisits >= 0][order]
+        return times, np.arange(1, times.size + 1)
+
+    def getCoverageAt(self, sampleIndices):
+        firstVisits = np.sort(self.firstVisits[self.firstVisits >= 0])
+        return np.searchsorted(firstVisits, sampleIndices, side='right')
+
+    def getTimeToCoverage(self, fraction=0.95):
+        times, coverage = self.getCoverageCurve()
+        if coverage.size == 0:
+            return None
+        target = m.ceil(fraction * coverage[-1])
+        return times[np.searchsorted(coverage, target)]
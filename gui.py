@@ -1,25 +1,40 @@
 # Author: Edward Romero, OSTEM Intern, NASA Kennedy Space Center, Spring 2025
 
 import csv
+import functools
+import multiprocessing
 import os
 import re
 import webbrowser
+import weakref
 import matplotlib
 import matplotlib.animation as animation
 import matplotlib.pyplot as plt
 from matplotlib import rcParams
 from matplotlib.animation import FFMpegWriter
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
 import numpy as np
-from dateutil import parser
 from PIL import Image, ImageTk
 import tkinter as tk
 import tkinter.ttk as ttk
 from tkinter import messagebox, filedialog
-from math_model import MathModel
-from fibonacci_lattice import FibonacciLattice
+from compute_worker import CONVERGENCE_STAGES, INGEST_STAGES, ComputeJob, ComputeProcess, ProcessJob, THEORETICAL_STAGES, cache_theoretical_results, compute_theoretical_results, coverage_by_frame, distribution_score, ingest_experimental_file, theoretical_model_data
+from decimation import MinMaxPyramid
+from convergence import DEFAULT_CONVERGENCE_THRESHOLD, convergence_time
+from accelerometer_data import AccelerometerFile, INVALID_CSV_MESSAGE, STREAMING_THRESHOLD_BYTES, read_sci_spinner_csv, read_timestamp_csv
+from math_model import MathModel, MODEL_VERSION
+from live_acquisition import LiveAcquisition, create_source
+from recording import AccelerometerRecording, is_recording, recording_path_for, write_recording
+from result_cache import ResultCache, DiskCache
+from time_index import TimeIndex
 
 SCRIPT_DIR = os.path.abspath(os.path.dirname(__file__))
+LIVE_REFRESH_MS = 500
+JOB_POLL_MS = 100
+DISTRIBUTION_ANIMATION_FRAMES = 500
+DISTRIBUTION_ANIMATION_INTERVAL_MS = 40
+DISTRIBUTION_ANIMATION_MAX_POINTS = 20000
 
 def validate_float(value):
     return re.fullmatch(r"-?\d*\.?\d*", value) is not None
@@ -27,6 +42,24 @@ def validate_float(value):
 def validate_positive_float(value):
     return re.fullmatch(r"\d*\.?\d*", value) is not None
 
+@functools.lru_cache(maxsize=None)
+def sphere_wireframe_segments(num_lines=25):
+    u = np.linspace(0, 2 * np.pi, num_lines)
+    v = np.linspace(0, np.pi, num_lines)
+    x = np.outer(np.cos(u), np.sin(v))
+    y = np.outer(np.sin(u), np.sin(v))
+    z = np.outer(np.ones(np.size(u)), np.cos(v))
+    mesh = np.stack((x, y, z), axis=-1)
+    return np.concatenate((mesh, mesh.transpose(1, 0, 2)))
+
+def animation_frame_positions(num_samples, num_frames=DISTRIBUTION_ANIMATION_FRAMES):
+    # a fixed number of frames per run, so playback takes as long for a week of data as for a minute
+    return np.unique(np.linspace(0, num_samples, min(num_frames, num_samples) + 1).round().astype(int))
+
+def animation_path_indices(num_samples, max_points=DISTRIBUTION_ANIMATION_MAX_POINTS):
+    # an evenly spaced subset of the path, so a full redraw of a long window stays as cheap as a short one
+    return np.unique(np.linspace(0, num_samples - 1, min(max_points, num_samples)).round().astype(int))
+
 class CustomToolbar(NavigationToolbar2Tk):
     def __init__(self, canvas, parent, export_magnitude_callback=None, export_components_callback=None, export_distribution_callback=None, export_animation_callback=None):
         self.toolitems = list(NavigationToolbar2Tk.toolitems)
@@ -87,6 +120,63 @@ class ToolTip:
             self.tip_window.destroy()
             self.tip_window = None
 
+class DistributionAnimation:
+    def __init__(self, ax, canvas, x_data, y_data, z_data, color, coverage_by_frame, num_frames=DISTRIBUTION_ANIMATION_FRAMES):
+        self.ax = ax
+        self.canvas = canvas
+        self.path = (x_data, y_data, z_data)
+        self.coverage_by_frame = coverage_by_frame
+        self.frame_positions = animation_frame_positions(len(x_data), num_frames)
+        self.path_indices = animation_path_indices(len(x_data))
+        self.frame = 0
+        self.num_shown = 0
+        self.background = None
+        # the trail holds everything played so far for full redraws; each frame blits only the new segment on top of it
+        self.trail, = ax.plot([], [], [], color=color, linewidth=1)
+        self.segment, = ax.plot([], [], [], color=color, linewidth=1, animated=True)
+        # a fixed corner, since a "best" placement would jump between the blitted frames and full redraws
+        self.legend = ax.legend([self.trail], [f"Distribution: {coverage_by_frame[-1]}"], loc='upper right')
+        self.legend.set_animated(True)
+        self.draw_id = canvas.mpl_connect('draw_event', self.on_draw)
+        self.event_source = canvas.new_timer(interval=DISTRIBUTION_ANIMATION_INTERVAL_MS)
+        self.event_source.add_callback(self.step)
+        self.event_source.start()
+
+    def on_draw(self, event):
+        # a full redraw (first show, resize, rotation) already contains the trail, so it becomes the new background
+        self.background = self.canvas.copy_from_bbox(self.ax.figure.bbox)
+        self.ax.draw_artist(self.legend)
+
+    def step(self):
+        num = self.frame_positions[self.frame]
+        self.frame += 1
+        num_shown = int(np.searchsorted(self.path_indices, num))
+        x_data, y_data, z_data = self.path
+        # the segment starts at the last vertex already drawn so consecutive frames join up
+        new = self.path_indices[max(self.num_shown - 1, 0):num_shown]
+        shown = self.path_indices[:num_shown]
+        self.num_shown = num_shown
+        self.segment.set_data(x_data[new], y_data[new])
+        self.segment.set_3d_properties(z_data[new])
+        self.trail.set_data(x_data[shown], y_data[shown])
+        self.trail.set_3d_properties(z_data[shown])
+        self.legend.get_texts()[0].set_text(f"Distribution: {self.coverage_by_frame[num]}")
+
+        if self.background is not None:
+            self.canvas.restore_region(self.background)
+            self.ax.draw_artist(self.segment)
+            self.background = self.canvas.copy_from_bbox(self.ax.figure.bbox)
+            self.ax.draw_artist(self.legend)
+            self.canvas.blit(self.ax.figure.bbox)
+
+        if self.frame == len(self.frame_positions):
+            self.legend.set_animated(False)
+            self.stop()
+
+    def stop(self):
+        self.event_source.stop()
+        self.canvas.mpl_disconnect(self.draw_id)
+
 class GUI:
     def __init__(self, master):
         self.master = master
@@ -106,11 +196,32 @@ class GUI:
         self.last_outer_position = None
         self.last_simulation_duration = None
         self.last_distance = None
+        self.last_sample_interval = "auto"
         self.last_experimental_data = None
         self.last_start_analysis_theo = None
         self.last_end_analysis_theo = None
         self.last_start_analysis_exp = None
         self.last_end_analysis_exp = None
+        self.distribution_animations = {}
+        self.detail_pyramids = weakref.WeakKeyDictionary()
+        self.dataset_indices = weakref.WeakKeyDictionary()
+        self.last_analysis_window_theo = None
+        self.experimental_window_path = None
+        self.live_acquisition = None
+        self.live_refresh_job = None
+        self.live_artists = None
+        self.compute_job = None
+        try:
+            disk_cache = DiskCache(version=MODEL_VERSION)
+        except OSError:
+            disk_cache = None
+        self.result_cache = ResultCache(disk_cache=disk_cache)
+        self.shared_results_job = None
+        try:
+            self.compute_process = ComputeProcess(cache_version=MODEL_VERSION)
+        except (OSError, RuntimeError):
+            self.compute_process = None
+        self.master.protocol("WM_DELETE_WINDOW", self.close)
 
     def setup_gui_elements(self):
         self.load_images()
@@ -132,7 +243,9 @@ class GUI:
         self.create_mode_frame(center_frame, font_style, category_font_style)
         self.create_theoretical_input_frames(center_frame, font_style, category_font_style)
         self.create_experimental_input_frames(center_frame, font_style, category_font_style)
+        self.create_live_input_frames(center_frame, font_style, category_font_style)
         self.create_start_button(center_frame, font_style)
+        self.create_status_bar()
 
     def load_images(self):
         nasa_image = Image.open(os.path.join(SCRIPT_DIR, 'images', 'NASA_logo.png')).resize((60, 50), Image.LANCZOS)
@@ -179,6 +292,7 @@ class GUI:
         menu_button.config(menu=self.mode_menu)
         self.mode_menu.add_radiobutton(label="Theoretical", variable=self.mode_var, value="Theoretical", command=lambda: self.switch_mode("Theoretical"))
         self.mode_menu.add_radiobutton(label="Experimental", variable=self.mode_var, value="Experimental", command=lambda: self.switch_mode("Experimental"))
+        self.mode_menu.add_radiobutton(label="Live", variable=self.mode_var, value="Live", command=lambda: self.switch_mode("Live"))
         menu_button.pack()
 
     def register_validations(self):
@@ -240,6 +354,8 @@ class GUI:
         
         self.simulation_duration_entry = tk.Entry(self.theoretical_duration_frame, font=font_style, width=20, validate="key", validatecommand=(self.validate_positive_float_cmd, "%P"))
         self.simulation_duration_entry.pack()
+        self.stop_at_convergence_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(self.theoretical_duration_frame, text="Stop at convergence", variable=self.stop_at_convergence_var, font=font_style).pack()
 
         self.theoretical_analysis_period_frame = tk.Frame(parent, padx=1, pady=1)
         self.theoretical_analysis_period_frame.grid(row=0, column=5, padx=15)
@@ -252,6 +368,19 @@ class GUI:
         self.end_analysis_theo_entry = tk.Entry(analysis_period_frame, font=font_style, width=10, validate="key", validatecommand=(self.validate_positive_float_cmd, "%P"))
         self.end_analysis_theo_entry.pack(side=tk.LEFT)
 
+        self.theoretical_sample_interval_frame = tk.Frame(parent, padx=1, pady=1)
+        self.theoretical_sample_interval_frame.grid(row=0, column=6, padx=15)
+        sample_interval_label_frame = tk.Frame(self.theoretical_sample_interval_frame)
+        sample_interval_label_frame.pack()
+        tk.Label(sample_interval_label_frame, text="Sample Interval (s)", font=category_font_style).pack(side=tk.LEFT)
+
+        sample_interval_info_icon = tk.Label(sample_interval_label_frame, image=self.info_icon)
+        sample_interval_info_icon.pack(side=tk.LEFT, padx=(0, 0))
+        ToolTip(sample_interval_info_icon, "Leave blank to choose automatically", x_offset=20, y_offset=0)
+
+        self.sample_interval_entry = tk.Entry(self.theoretical_sample_interval_frame, font=font_style, width=20, validate="key", validatecommand=(self.validate_positive_float_cmd, "%P"))
+        self.sample_interval_entry.pack()
+
     def create_experimental_input_frames(self, parent, font_style, category_font_style):
         self.experimental_data_frame = tk.Frame(parent, padx=1, pady=1)
         self.experimental_data_frame.grid(row=0, column=1, padx=15)
@@ -279,9 +408,39 @@ class GUI:
         self.end_analysis_exp_entry = tk.Entry(analysis_period_frame_exp, font=font_style, width=10, validate="key", validatecommand=(self.validate_positive_float_cmd, "%P"))
         self.end_analysis_exp_entry.pack(side=tk.LEFT)
 
+    def create_live_input_frames(self, parent, font_style, category_font_style):
+        self.live_source_frame = tk.Frame(parent, padx=1, pady=1)
+        self.live_source_frame.grid(row=0, column=1, padx=15)
+        self.live_source_frame.grid_remove()
+
+        source_label_frame = tk.Frame(self.live_source_frame)
+        source_label_frame.pack()
+        tk.Label(source_label_frame, text="Accelerometer Source", font=category_font_style).pack(side=tk.LEFT)
+
+        source_info_icon = tk.Label(source_label_frame, image=self.info_icon)
+        source_info_icon.pack(side=tk.LEFT, padx=(0, 0))
+        ToolTip(source_info_icon, "I2C: bus:address (1:0x53)\nSocket: host:port\nFile: path", x_offset=20, y_offset=0)
+
+        source_input_frame = tk.Frame(self.live_source_frame)
+        source_input_frame.pack()
+        self.live_source_var = tk.StringVar(value="File")
+        source_menu = tk.OptionMenu(source_input_frame, self.live_source_var, "I2C", "Socket", "File")
+        source_menu.config(font=font_style, bg="#aeb0b5", activebackground="#d6d7d9", highlightthickness=0)
+        source_menu.pack(side=tk.LEFT)
+        self.live_address_entry = tk.Entry(source_input_frame, font=font_style, width=24)
+        self.live_address_entry.pack(side=tk.LEFT, padx=(5, 0))
+
     def create_start_button(self, parent, font_style):
         self.start_button = tk.Button(parent, text="Start", command=self.start_simulation, font=font_style, bg="#0066b2", fg="#ffffff", activebackground="#3380cc", activeforeground="#ffffff")
-        self.start_button.grid(row=1, column=0, columnspan=6, pady=(10, 5))
+        self.start_button.grid(row=1, column=0, columnspan=7, pady=(10, 5))
+
+    def create_status_bar(self):
+        status_frame = tk.Frame(self.master)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X)
+        self.status_label = tk.Label(status_frame, text="", font=("Calibri", 9), anchor=tk.W)
+        self.status_label.pack(side=tk.LEFT, padx=(10, 0))
+        self.progress_bar = ttk.Progressbar(status_frame, length=200, maximum=1.0)
+        self.progress_bar.pack(side=tk.RIGHT, padx=(0, 10), pady=(0, 2))
 
     def setup_plot_frames(self):
         plot_frame = tk.Frame(self.master, padx=5, pady=5)
@@ -495,12 +654,7 @@ class GUI:
         ax.yaxis.set_pane_color((1.0, 1.0, 1.0, 0.0))  
         ax.zaxis.set_pane_color((1.0, 1.0, 1.0, 0.0))  
 
-        u = np.linspace(0, 2 * np.pi, 25)
-        v = np.linspace(0, np.pi, 25)
-        x = np.outer(np.cos(u), np.sin(v))
-        y = np.outer(np.sin(u), np.sin(v))
-        z = np.outer(np.ones(np.size(u)), np.cos(v))
-        ax.plot_wireframe(x, y, z, color='#aeb0b5', linewidth=0.5, alpha=0.5, label='_nolegend_')
+        ax.add_collection3d(Line3DCollection(sphere_wireframe_segments(), color='#aeb0b5', linewidth=0.5, alpha=0.5, label='_nolegend_'), autolim=False)
 
     def create_custom_theme(self):
         style = ttk.Style()
@@ -525,12 +679,17 @@ class GUI:
         self.mode_menu.master.config(text=mode)
         self.mode_label.config(text="Mode")
 
+        self.stop_live_acquisition()
+        self.cancel_compute_job()
         if mode == "Theoretical":
             self.mode_icon.pack(side=tk.LEFT, padx=(1, 0))
             self.show_theoretical_inputs()
-        else:
+        elif mode == "Experimental":
             self.mode_icon.pack_forget()
             self.show_experimental_inputs()
+        else:
+            self.mode_icon.pack_forget()
+            self.show_live_inputs()
 
     def show_theoretical_inputs(self):
         self.theoretical_angular_velocity_frame.grid()
@@ -538,9 +697,11 @@ class GUI:
         self.theoretical_distance_frame.grid()
         self.theoretical_duration_frame.grid()
         self.theoretical_analysis_period_frame.grid()
+        self.theoretical_sample_interval_frame.grid()
         self.experimental_data_frame.grid_remove()
         self.experimental_analysis_period_frame.grid_remove()
-        self.start_button.grid(row=1, column=0, columnspan=6, pady=(10, 5))
+        self.live_source_frame.grid_remove()
+        self.start_button.grid(row=1, column=0, columnspan=7, pady=(10, 5))
 
         while self.notebook.index("end") > 0:
             self.notebook.forget(0)
@@ -556,8 +717,10 @@ class GUI:
         self.theoretical_distance_frame.grid_remove()
         self.theoretical_duration_frame.grid_remove()
         self.theoretical_analysis_period_frame.grid_remove()
+        self.theoretical_sample_interval_frame.grid_remove()
         self.experimental_data_frame.grid(row=0, column=1, padx=15)
         self.experimental_analysis_period_frame.grid(row=0, column=2, padx=15)
+        self.live_source_frame.grid_remove()
         self.start_button.grid(row=1, column=0, columnspan=3, pady=(10, 5))
 
         while self.notebook.index("end") > 0:
@@ -567,6 +730,25 @@ class GUI:
         self.notebook.add(self.experimental_acceleration_distribution_frame, text="Orientation Distribution")
         self.clear_experimental_plots()
 
+    def show_live_inputs(self):
+        self.theoretical_angular_velocity_frame.grid_remove()
+        self.theoretical_angular_position_frame.grid_remove()
+        self.theoretical_distance_frame.grid_remove()
+        self.theoretical_duration_frame.grid_remove()
+        self.theoretical_analysis_period_frame.grid_remove()
+        self.theoretical_sample_interval_frame.grid_remove()
+        self.experimental_data_frame.grid_remove()
+        self.experimental_analysis_period_frame.grid_remove()
+        self.live_source_frame.grid(row=0, column=1, padx=15)
+        self.start_button.grid(row=1, column=0, columnspan=2, pady=(10, 5))
+
+        while self.notebook.index("end") > 0:
+            self.notebook.forget(0)
+
+        self.notebook.add(self.experimental_g_acceleration_frame, text="Gravitational Acceleration")
+        self.notebook.add(self.experimental_acceleration_distribution_frame, text="Orientation Distribution")
+        self.clear_experimental_plots()
+
     def export_theoretical_g_magnitude_data(self):
         file_path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV files", "*.csv")])
         if file_path:
@@ -576,7 +758,7 @@ class GUI:
                 with open(file_path, mode='w', newline='') as file:
                     writer = csv.writer(file)
                     writer.writerow(["Time (h)", "Acceleration (g)"])
-                    for time, mag in zip(self.theoretical_g_acceleration_ax.lines[0].get_xdata(), self.theoretical_g_acceleration_ax.lines[0].get_ydata()):
+                    for time, mag in zip(*self.get_line_data(self.theoretical_g_acceleration_ax.lines[0])):
                         writer.writerow([time, mag])
                 messagebox.showinfo("Success", "Data exported successfully.")
             except Exception as e:
@@ -591,10 +773,9 @@ class GUI:
                 with open(file_path, mode='w', newline='') as file:
                     writer = csv.writer(file)
                     writer.writerow(["Time (h)", "X (g)", "Y (g)", "Z (g)"])
-                    time_data = self.theoretical_g_components_ax.lines[0].get_xdata()
-                    x_data = self.theoretical_g_components_ax.lines[0].get_ydata()
-                    y_data = self.theoretical_g_components_ax.lines[1].get_ydata()
-                    z_data = self.theoretical_g_components_ax.lines[2].get_ydata()
+                    time_data, x_data = self.get_line_data(self.theoretical_g_components_ax.lines[0])
+                    _, y_data = self.get_line_data(self.theoretical_g_components_ax.lines[1])
+                    _, z_data = self.get_line_data(self.theoretical_g_components_ax.lines[2])
                     for time, x, y, z in zip(time_data, x_data, y_data, z_data):
                         writer.writerow([time, x, y, z])
                 messagebox.showinfo("Success", "Data exported successfully.")
@@ -610,7 +791,7 @@ class GUI:
                 with open(file_path, mode='w', newline='') as file:
                     writer = csv.writer(file)
                     writer.writerow(["Time (h)", "Acceleration (g)"])
-                    for time, mag in zip(self.theoretical_non_g_acceleration_ax.lines[0].get_xdata(), self.theoretical_non_g_acceleration_ax.lines[0].get_ydata()):
+                    for time, mag in zip(*self.get_line_data(self.theoretical_non_g_acceleration_ax.lines[0])):
                         writer.writerow([time, mag])
                 messagebox.showinfo("Success", "Data exported successfully.")
             except Exception as e:
@@ -625,10 +806,9 @@ class GUI:
                 with open(file_path, mode='w', newline='') as file:
                     writer = csv.writer(file)
                     writer.writerow(["Time (h)", "X (g)", "Y (g)", "Z (g)"])
-                    time_data = self.theoretical_non_g_components_ax.lines[0].get_xdata()
-                    x_data = self.theoretical_non_g_components_ax.lines[0].get_ydata()
-                    y_data = self.theoretical_non_g_components_ax.lines[1].get_ydata()
-                    z_data = self.theoretical_non_g_components_ax.lines[2].get_ydata()
+                    time_data, x_data = self.get_line_data(self.theoretical_non_g_components_ax.lines[0])
+                    _, y_data = self.get_line_data(self.theoretical_non_g_components_ax.lines[1])
+                    _, z_data = self.get_line_data(self.theoretical_non_g_components_ax.lines[2])
                     for time, x, y, z in zip(time_data, x_data, y_data, z_data):
                         writer.writerow([time, x, y, z])
                 messagebox.showinfo("Success", "Data exported successfully.")
@@ -643,7 +823,9 @@ class GUI:
                     raise ValueError("No data available to export.")
                 line = self.theoretical_acceleration_distribution_ax.lines[0]
                 x_data, y_data, z_data = line.get_data_3d()
-                time_data = self.theoretical_non_g_acceleration_ax.lines[0].get_xdata()
+                time_data, _ = self.get_line_data(self.theoretical_non_g_acceleration_ax.lines[0])
+                if len(x_data) < len(time_data):
+                    x_data, y_data, z_data = MathModel.take_periodic(np.array([x_data, y_data, z_data]), 0, len(time_data))
                 with open(file_path, mode='w', newline='') as file:
                     writer = csv.writer(file)
                     writer.writerow(["Time (h)", "X (g)", "Y (g)", "Z (g)"])
@@ -662,7 +844,8 @@ class GUI:
                 with open(file_path, mode='w', newline='') as file:
                     writer = csv.writer(file)
                     writer.writerow(["Time (h)", "Acceleration (g)"])
-                    for time, mag in zip(self.experimental_g_acceleration_ax_left.lines[0].get_xdata(), self.experimental_g_acceleration_ax_left.lines[0].get_ydata()):
+                    time_data, magnitude_data = self.get_experimental_export_data(self.experimental_g_acceleration_ax_left.lines[:1], "magnitude")
+                    for time, mag in zip(time_data, magnitude_data):
                         writer.writerow([time, mag])
                 messagebox.showinfo("Success", "Data exported successfully.")
             except Exception as e:
@@ -677,10 +860,7 @@ class GUI:
                 with open(file_path, mode='w', newline='') as file:
                     writer = csv.writer(file)
                     writer.writerow(["Time (h)", "X (g)", "Y (g)", "Z (g)"])
-                    time_data = self.experimental_g_acceleration_ax_right.lines[0].get_xdata()
-                    x_data = self.experimental_g_acceleration_ax_right.lines[0].get_ydata()
-                    y_data = self.experimental_g_acceleration_ax_right.lines[1].get_ydata()
-                    z_data = self.experimental_g_acceleration_ax_right.lines[2].get_ydata()
+                    time_data, x_data, y_data, z_data = self.get_experimental_export_data(self.experimental_g_acceleration_ax_right.lines[:3], "x_avg", "y_avg", "z_avg")
                     for time, x, y, z in zip(time_data, x_data, y_data, z_data):
                         writer.writerow([time, x, y, z])
                 messagebox.showinfo("Success", "Data exported successfully.")
@@ -693,9 +873,12 @@ class GUI:
             try:
                 if not self.experimental_acceleration_distribution_ax.lines:
                     raise ValueError("No data available to export.")
-                line = self.experimental_acceleration_distribution_ax.lines[0]
-                x_data, y_data, z_data = line.get_data_3d()
-                time_data = self.experimental_g_acceleration_ax_left.lines[0].get_xdata()
+                if isinstance(self.last_experimental_data, AccelerometerRecording):
+                    # the plotted path is the recording's decimated summary, so the export reads the samples themselves
+                    time_data, x_data, y_data, z_data = self.last_experimental_data.columns()
+                else:
+                    time_data, _ = self.get_line_data(self.experimental_g_acceleration_ax_left.lines[0])
+                    x_data, y_data, z_data = self.experimental_acceleration_distribution_ax.lines[0].get_data_3d()
                 with open(file_path, mode='w', newline='') as file:
                     writer = csv.writer(file)
                     writer.writerow(["Time (h)", "X (g)", "Y (g)", "Z (g)"])
@@ -722,36 +905,28 @@ class GUI:
                     theta_1_init = self.last_outer_position if self.last_outer_position is not None else 0.0
                     delta_m = self.last_distance if self.last_distance is not None else 0.0
                     duration_hours = self.last_simulation_duration
-                    theoretical_model = MathModel(outer_rpm, inner_rpm, theta_1_init, theta_2_init, delta_m, delta_m, delta_m, duration_hours)
-                    time_array, _, _, a_tot_array = theoretical_model.calculate_acceleration()
-                    x_data, y_data, z_data = a_tot_array[0], a_tot_array[1], a_tot_array[2]
-                    time_data = time_array / 3600
+                    time_array, _, a_tot_array = self.get_theoretical_model_data(outer_rpm, inner_rpm, theta_1_init, theta_2_init, delta_m, delta_m, delta_m, duration_hours, self.last_sample_interval)
+                    start_index, end_index = self.last_analysis_window_theo
+                    sliced_x, sliced_y, sliced_z = MathModel.take_periodic(a_tot_array, start_index, end_index)
 
                 elif self.last_mode == "Experimental":
                     if not self.experimental_acceleration_distribution_analysis_ax.lines:
                         raise ValueError("No data available to export.")
-                    
-                    if isinstance(self.last_experimental_data, tuple): 
-                        time_data, x_data, y_data, z_data = self.last_experimental_data
-                    else: 
-                        datetime_str = []
-                        x_data, y_data, z_data = [], [], []
-                        for k in range(0, len(self.last_experimental_data) - 4, 5):
-                            try:
-                                dt = parser.parse(self.last_experimental_data[k] + " " + self.last_experimental_data[k + 1])
-                            except ValueError:
-                                dt = parser.parse(self.last_experimental_data[k + 1] + " " + self.last_experimental_data[k])
-                            datetime_str.append(dt)
-                            x_data.append(float(self.last_experimental_data[k + 2]))
-                            y_data.append(float(self.last_experimental_data[k + 3]))
-                            z_data.append(float(self.last_experimental_data[k + 4]))
-                        time_data = [(dt - datetime_str[0]).total_seconds() / 3600 for dt in datetime_str]
-
-                start_index = next(i for i, t in enumerate(time_data) if t >= start_analysis)
-                end_index = next(i for i, t in enumerate(time_data) if t >= end_analysis)
-                sliced_x = np.array(x_data[start_index:end_index])
-                sliced_y = np.array(y_data[start_index:end_index])
-                sliced_z = np.array(z_data[start_index:end_index])
+
+                    if isinstance(self.last_experimental_data, AccelerometerFile):
+                        sliced_x, sliced_y, sliced_z = self.experimental_window_path
+                    elif isinstance(self.last_experimental_data, AccelerometerRecording):
+                        recording = self.last_experimental_data
+                        window = recording.window(recording.find_index(start_analysis), recording.find_index(end_analysis))
+                        sliced_x, sliced_y, sliced_z = (np.asarray(column) for column in window)
+                    else:
+                        _, x_data, y_data, z_data = self.last_experimental_data.columns()
+                        start_index, end_index = self.get_dataset_index(self.last_experimental_data)[2].window(start_analysis, end_analysis)
+                        sliced_x = np.array(x_data[start_index:end_index])
+                        sliced_y = np.array(y_data[start_index:end_index])
+                        sliced_z = np.array(z_data[start_index:end_index])
+                else:
+                    raise ValueError("No data available to export.")
 
                 if sliced_x.size == 0 or sliced_y.size == 0 or sliced_z.size == 0:
                     raise ValueError("No data available to export.")
@@ -759,14 +934,16 @@ class GUI:
                 fig = plt.Figure(figsize=(8, 6), dpi=100)
                 ax = fig.add_subplot(111, projection='3d')
                 self.configure_3d_axes(ax, "Orientation Distribution")
+                line, = ax.plot([], [], [], color='#ec1c24', linewidth=1)
+                path_indices = animation_path_indices(len(sliced_x))
 
                 def update(num):
-                    ax.clear()
-                    self.configure_3d_axes(ax, "Orientation Distribution")
-                    ax.plot(sliced_x[:num], sliced_y[:num], sliced_z[:num], color='#ec1c24', linewidth=1)
-                    return ax,
+                    shown = path_indices[:np.searchsorted(path_indices, num)]
+                    line.set_data(sliced_x[shown], sliced_y[shown])
+                    line.set_3d_properties(sliced_z[shown])
+                    return line,
 
-                ani = animation.FuncAnimation(fig, update, frames=len(sliced_x), interval=10, blit=False)
+                ani = animation.FuncAnimation(fig, update, frames=animation_frame_positions(len(sliced_x)), interval=DISTRIBUTION_ANIMATION_INTERVAL_MS, blit=False)
                 writer = FFMpegWriter(fps=10, metadata=dict(artist='NASA'), bitrate=1800)
                 ani.save(file_path, writer=writer)
 
@@ -804,6 +981,7 @@ class GUI:
         self.configure_3d_axes(self.theoretical_acceleration_distribution_ax, "Orientation Distribution")
         self.theoretical_acceleration_distribution_canvas.draw()
 
+        self.stop_distribution_animation(self.theoretical_acceleration_distribution_analysis_ax)
         self.theoretical_acceleration_distribution_analysis_ax.clear()
         self.configure_3d_axes(self.theoretical_acceleration_distribution_analysis_ax, "Orientation Distribution")
         self.theoretical_acceleration_distribution_analysis_canvas.draw()
@@ -825,6 +1003,7 @@ class GUI:
         self.configure_3d_axes(self.experimental_acceleration_distribution_ax, "Orientation Distribution")
         self.experimental_acceleration_distribution_canvas.draw()
 
+        self.stop_distribution_animation(self.experimental_acceleration_distribution_analysis_ax)
         self.experimental_acceleration_distribution_analysis_ax.clear()
         self.configure_3d_axes(self.experimental_acceleration_distribution_analysis_ax, "Orientation Distribution")
         self.experimental_acceleration_distribution_analysis_canvas.draw()
@@ -833,57 +1012,128 @@ class GUI:
         file_path = filedialog.askopenfilename(filetypes=[("CSV files", "*.csv")])
         if file_path:
             try:
-                try:
-                    self.experimental_data = import_sci_spinner_format_data(file_path)
-                    messagebox.showinfo("Success", "CSV file uploaded successfully.")
-                except ValueError:
-                    with open(file_path, 'r') as file:
-                        main_array = file.read().replace("   ", " ").replace('\t', ' ').replace('\n', ' ').replace(',', ' ').split(' ')
-                    self.experimental_data = main_array
-                    messagebox.showinfo("Success", "CSV file uploaded successfully.")
+                recording = self.open_recording(file_path)
+                if recording is not None:
+                    self.experimental_data = recording
+                elif os.path.getsize(file_path) > STREAMING_THRESHOLD_BYTES:
+                    self.experimental_data = AccelerometerFile(file_path)
+                else:
+                    try:
+                        experimental_data = read_sci_spinner_csv(file_path)
+                    except ValueError:
+                        experimental_data = read_timestamp_csv(file_path)
+                    self.experimental_data = self.convert_to_recording(experimental_data, file_path)
+                messagebox.showinfo("Success", "CSV file uploaded successfully.")
+            except ValueError:
+                self.experimental_data = None
+                messagebox.showerror("Error", INVALID_CSV_MESSAGE)
             except FileNotFoundError:
                 messagebox.showerror("File Error", f"File not found: {file_path}")
             except Exception as e:
                 messagebox.showerror("Error", str(e))
 
-    def process_experimental_data(self, main_array, start_analysis, end_analysis, is_sci_spinner_format=False):
-        if is_sci_spinner_format:
-            time_in_hours, x, y, z = main_array
-        else:
-            datetime_str = []
-            x, y, z = [], [], []
-            for k in range(0, len(main_array) - 4, 5):
-                try:
-                    dt = parser.parse(main_array[k] + " " + main_array[k + 1])
-                except ValueError:
-                    dt = parser.parse(main_array[k + 1] + " " + main_array[k])
-                datetime_str.append(dt)
-                x.append(float(main_array[k + 2]))
-                y.append(float(main_array[k + 3]))
-                z.append(float(main_array[k + 4]))
-            time_in_seconds = [(dt - datetime_str[0]).total_seconds() for dt in datetime_str]
-            time_in_hours = [t / 3600 for t in time_in_seconds]
-
-        if not time_in_hours or not any(x) or not any(y) or not any(z):
-            messagebox.showerror(
-                "Error",
-                "Invalid CSV file format.\n\n"
-                "Supported CSV file formats:\n"
-                "(1) Timestamp (yyyy-mm-dd hh:mm:ss.sss), X (g), Y (g), Z (g)\n\n"
-                "(2) Timestamp (s), X (m/s²), Y (m/s²), Z (m/s²)"
-            )
+    def open_recording(self, file_path):
+        try:
+            recording_path = recording_path_for(file_path)
+            if is_recording(recording_path):
+                return AccelerometerRecording(recording_path)
+        except (OSError, ValueError, KeyError):
+            pass
+        return None
+
+    def convert_to_recording(self, experimental_data, file_path):
+        try:
+            return write_recording(experimental_data, recording_path_for(file_path))
+        except OSError:
+            return experimental_data
+
+    def process_experimental_data(self, experimental_data, start_analysis, end_analysis):
+        if isinstance(experimental_data, AccelerometerRecording):
+            self.process_recorded_experimental_data(experimental_data, start_analysis, end_analysis)
+            return
+        if isinstance(experimental_data, AccelerometerFile):
+            self.process_streamed_experimental_data(experimental_data, start_analysis, end_analysis)
+            return
+
+        time_in_hours, x, y, z = experimental_data.columns()
+
+        if len(time_in_hours) == 0 or not np.any(x) or not np.any(y) or not np.any(z):
+            messagebox.showerror("Error", INVALID_CSV_MESSAGE)
             return
 
         if end_analysis is not None:
-            if end_analysis > max(time_in_hours):
+            if end_analysis > np.max(time_in_hours):
                 raise ValueError("Upper bound for time period of analysis exceeds the final timestamp available in the CSV file.")
         if start_analysis is not None and end_analysis is not None:
             if end_analysis <= start_analysis:
                 raise ValueError("Lower bound for time period of analysis must be < the upper bound.")
 
-        path_vis = FibonacciLattice("experimental", x, y, z)
-        distribution_score = path_vis.getDistribution()
-        self.update_experimental_plots(x, y, z, time_in_hours, start_analysis, end_analysis, distribution_score)
+        distribution_score = self.get_distribution_score("experimental", x, y, z)
+        self.update_experimental_plots(experimental_data, start_analysis, end_analysis, distribution_score)
+
+    def process_streamed_experimental_data(self, experimental_file, start_analysis, end_analysis):
+        if start_analysis is not None and end_analysis is not None:
+            if end_analysis <= start_analysis:
+                raise ValueError("Lower bound for time period of analysis must be < the upper bound.")
+
+        # the ingest runs as a job, so the window stays responsive and Start cancels it like a theoretical run
+        self.start_ingest_job(experimental_file, start_analysis, end_analysis)
+
+    def start_ingest_job(self, experimental_file, start_analysis, end_analysis):
+        job = ComputeJob(ingest_experimental_file, experimental_file, start_analysis, end_analysis, stages=INGEST_STAGES).start()
+        self.follow_compute_job(job, lambda result: self.apply_streamed_experimental_results(result, start_analysis, end_analysis),
+                                lambda result: self.draw_streamed_experimental_plots(result, None, None))
+
+    def apply_streamed_experimental_results(self, result, start_analysis, end_analysis):
+        if result["recording"] is not None:
+            # later Starts and the exports read the recording, which keeps the resolution of the CSV
+            self.experimental_data = result["recording"]
+            self.last_experimental_data = result["recording"]
+
+        if result["num_samples"] == 0 or not result["any_nonzero"].all():
+            messagebox.showerror("Error", INVALID_CSV_MESSAGE)
+            return
+
+        if end_analysis is not None:
+            if end_analysis > result["max_time"]:
+                raise ValueError("Upper bound for time period of analysis exceeds the final timestamp available in the CSV file.")
+
+        self.draw_streamed_experimental_plots(result, start_analysis, end_analysis)
+        self.experimental_window_path = result["window_path"]
+
+    def process_recorded_experimental_data(self, recording, start_analysis, end_analysis):
+        summary = recording.summary
+        if summary["num_samples"] == 0 or not summary["any_nonzero"].all():
+            messagebox.showerror("Error", INVALID_CSV_MESSAGE)
+            return
+
+        if end_analysis is not None:
+            if end_analysis > summary["max_time"]:
+                raise ValueError("Upper bound for time period of analysis exceeds the final timestamp available in the CSV file.")
+        if start_analysis is not None and end_analysis is not None:
+            if end_analysis <= start_analysis:
+                raise ValueError("Lower bound for time period of analysis must be < the upper bound.")
+
+        # the averages and their pyramids were stored when the recording was written, so a Start reads only what it draws
+        pyramids = [recording.pyramid(name) for name in ("magnitude", "x_avg", "y_avg", "z_avg")]
+        analysis_window = None
+        avg_mag_analysis = None
+        window_path = None
+        if start_analysis is not None and end_analysis is not None:
+            analysis_window = (recording.find_index(start_analysis), recording.find_index(end_analysis))
+            window_magnitude = recording.window_magnitude(*analysis_window)
+            avg_mag_analysis = window_magnitude.mean() if window_magnitude.size else np.nan
+            window_path = recording.window(*analysis_window)
+
+        self.draw_experimental_plots(pyramids, float(summary["avg_g_magnitude"]), float(summary["converged_at"]), summary["path"], int(summary["distribution"]),
+                                     start_analysis, end_analysis, analysis_window, avg_mag_analysis, window_path)
+
+    def draw_streamed_experimental_plots(self, result, start_analysis, end_analysis):
+        has_window = start_analysis is not None and end_analysis is not None
+        pyramids = [MinMaxPyramid(result["time_in_hours"], series) for series in (result["magnitude"],) + tuple(result["time_avg"])]
+        self.draw_experimental_plots(pyramids, result["avg_g_magnitude"], result["converged_at"], result["path"],
+                                     result["distribution"], start_analysis, end_analysis, result["analysis_window"] if has_window else None,
+                                     result["avg_window_magnitude"], result["window_path"] if has_window else None, result["window_coverage_by_frame"])
 
     def process_experimental_data_submission(self):
         try:
@@ -895,10 +1145,7 @@ class GUI:
             start_analysis = float(start_analysis) if start_analysis else None
             end_analysis = float(end_analysis) if end_analysis else None
 
-            if isinstance(self.experimental_data, tuple): 
-                self.process_experimental_data(self.experimental_data, start_analysis, end_analysis, is_sci_spinner_format=True)
-            else:
-                self.process_experimental_data(self.experimental_data, start_analysis, end_analysis)
+            self.process_experimental_data(self.experimental_data, start_analysis, end_analysis)
 
         except ValueError as ve:
             if "Upload a CSV file" in str(ve):
@@ -908,53 +1155,70 @@ class GUI:
             elif "Lower bound for time period of analysis" in str(ve):
                 messagebox.showerror("Error", str(ve))
             else:
-                messagebox.showerror(
-                    "Error",
-                    "Invalid CSV file format.\n\n"
-                    "Supported CSV file formats:\n"
-                    "(1) Timestamp (yyyy-mm-dd hh:mm:ss.sss), X (g), Y (g), Z (g)\n"
-                    "(2) Timestamp (s), X (m/s²), Y (m/s²), Z (m/s²)"
-                )
+                messagebox.showerror("Error", INVALID_CSV_MESSAGE)
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
-    def animate_distribution(self, ax, canvas, x_data, y_data, z_data, color, label):
+    def stop_distribution_animation(self, ax):
+        previous_animation = self.distribution_animations.pop(ax, None)
+        if previous_animation is not None:
+            previous_animation.stop()
+
+    def animate_distribution(self, ax, canvas, x_data, y_data, z_data, color, coverage_by_frame=None, num_frames=DISTRIBUTION_ANIMATION_FRAMES):
+        self.stop_distribution_animation(ax)
         ax.clear()
         self.configure_3d_axes(ax, "Orientation Distribution")
-        line, = ax.plot([], [], [], color=color, linewidth=1)
-
-        path_vis = FibonacciLattice("animated", x_data, y_data, z_data)
-        distribution_score = path_vis.getDistribution()
-
-        def update(num):
-            line.set_data(x_data[:num], y_data[:num])
-            line.set_3d_properties(z_data[:num])
-            return line,
 
-        ax.legend([f"Distribution: {distribution_score}"])
-        ani = animation.FuncAnimation(ax.figure, update, frames=len(x_data), interval=10, blit=False)
+        if coverage_by_frame is None:
+            coverage_by_frame = self.get_coverage_by_frame(x_data, y_data, z_data)
+        self.distribution_animations[ax] = DistributionAnimation(ax, canvas, x_data, y_data, z_data, color, coverage_by_frame, num_frames)
         canvas.draw()
 
-    def update_experimental_plots(self, x, y, z, time_in_hours, start_analysis, end_analysis, distribution_score):
+    def get_dataset_index(self, experimental_data):
+        # the time averages and their index depend only on the data, so every Start and export on the same dataset shares them
+        dataset_index = self.dataset_indices.get(experimental_data)
+        if dataset_index is None:
+            time_in_hours, x, y, z = experimental_data.columns()
+            counts = np.arange(1, len(time_in_hours) + 1)
+            time_avg = (np.cumsum(x) / counts, np.cumsum(y) / counts, np.cumsum(z) / counts)
+            magnitude = np.sqrt(time_avg[0]**2 + time_avg[1]**2 + time_avg[2]**2)
+            dataset_index = (time_avg, magnitude, TimeIndex(time_in_hours, magnitude=magnitude))
+            self.dataset_indices[experimental_data] = dataset_index
+        return dataset_index
+
+    def update_experimental_plots(self, experimental_data, start_analysis, end_analysis, distribution_score):
+        time_in_hours, x, y, z = experimental_data.columns()
+        time_avg, magnitude, time_index = self.get_dataset_index(experimental_data)
+        avg_mag_full = time_index.mean_between("magnitude", 0, len(time_index))
+
+        analysis_window = None
+        avg_mag_analysis = None
+        window_path = None
+        if start_analysis is not None and end_analysis is not None:
+            analysis_window = time_index.window(start_analysis, end_analysis)
+            avg_mag_analysis = time_index.mean_between("magnitude", *analysis_window)
+            start_seg, end_seg = analysis_window
+            window_path = (x[start_seg:end_seg], y[start_seg:end_seg], z[start_seg:end_seg])
+
+        pyramids = [MinMaxPyramid(time_in_hours, series) for series in (magnitude,) + tuple(time_avg)]
+        self.draw_experimental_plots(pyramids, avg_mag_full, convergence_time(time_in_hours, magnitude, DEFAULT_CONVERGENCE_THRESHOLD), (x, y, z), distribution_score,
+                                     start_analysis, end_analysis, analysis_window, avg_mag_analysis, window_path)
+
+    def draw_experimental_plots(self, pyramids, avg_mag_full, converged_at, path, distribution_score,
+                                start_analysis, end_analysis, analysis_window, avg_mag_analysis, window_path, window_coverage_by_frame=None):
+        magnitude_pyramid, x_pyramid, y_pyramid, z_pyramid = pyramids
+        x, y, z = path
         self.experimental_g_acceleration_ax_left.clear()
         self.experimental_g_acceleration_ax_left.set_title("Time-Averaged Gravitational Acceleration")
-
-        x_time_avg = np.cumsum(x) / np.arange(1, len(x) + 1)
-        y_time_avg = np.cumsum(y) / np.arange(1, len(y) + 1)
-        z_time_avg = np.cumsum(z) / np.arange(1, len(z) + 1)
-        magnitude = np.sqrt(x_time_avg**2 + y_time_avg**2 + z_time_avg**2)
-        avg_mag_full = np.mean(magnitude)
-
-        self.experimental_g_acceleration_ax_left.plot(time_in_hours, magnitude, color='#0066B2', label=f"Magnitude: {avg_mag_full:.3g}")
+        self.plot_pyramid(self.experimental_g_acceleration_ax_left, magnitude_pyramid, color='#0066B2', label=f"Magnitude: {avg_mag_full:.3g}")
         
-        if start_analysis is not None and end_analysis is not None:
-            start_seg = next(i for i, t in enumerate(time_in_hours) if t >= start_analysis)
-            end_seg = next(i for i, t in enumerate(time_in_hours) if t >= end_analysis)
+        if analysis_window is not None:
+            start_seg, end_seg = analysis_window
             self.experimental_g_acceleration_ax_left.axvline(x=start_analysis, color='#EC1C24', linestyle='--')
             self.experimental_g_acceleration_ax_left.axvline(x=end_analysis, color='#EC1C24', linestyle='--')
-            avg_mag_analysis = np.mean(magnitude[start_seg:end_seg])
-            self.experimental_g_acceleration_ax_left.plot(time_in_hours[start_seg:end_seg], magnitude[start_seg:end_seg], color='#EC1C24', label=f"Magnitude: {avg_mag_analysis:.3g}")
+            self.plot_pyramid(self.experimental_g_acceleration_ax_left, magnitude_pyramid.window(start_seg, end_seg), color='#EC1C24', label=f"Magnitude: {avg_mag_analysis:.3g}")
 
+        self.plot_convergence_time(self.experimental_g_acceleration_ax_left, converged_at)
         self.experimental_g_acceleration_ax_left.legend()
         self.experimental_g_acceleration_ax_left.set_xlabel('Time (h)')
         self.experimental_g_acceleration_ax_left.set_ylabel('Acceleration (g)')
@@ -962,9 +1226,9 @@ class GUI:
 
         self.experimental_g_acceleration_ax_right.clear()
         self.experimental_g_acceleration_ax_right.set_title('Time-Averaged Gravitational Acceleration')
-        self.experimental_g_acceleration_ax_right.plot(time_in_hours, x_time_avg, label='X', color='#6EAE39')
-        self.experimental_g_acceleration_ax_right.plot(time_in_hours, y_time_avg, label='Y', color='#EF7A35')
-        self.experimental_g_acceleration_ax_right.plot(time_in_hours, z_time_avg, label='Z', color='mediumorchid')
+        self.plot_pyramid(self.experimental_g_acceleration_ax_right, x_pyramid, label='X', color='#6EAE39')
+        self.plot_pyramid(self.experimental_g_acceleration_ax_right, y_pyramid, label='Y', color='#EF7A35')
+        self.plot_pyramid(self.experimental_g_acceleration_ax_right, z_pyramid, label='Z', color='mediumorchid')
         self.experimental_g_acceleration_ax_right.set_xlabel('Time (h)')
         self.experimental_g_acceleration_ax_right.set_ylabel('Acceleration (g)')
         self.experimental_g_acceleration_ax_right.legend()
@@ -976,19 +1240,16 @@ class GUI:
         self.experimental_acceleration_distribution_ax.legend([f"Distribution: {distribution_score}"])
         self.experimental_acceleration_distribution_canvas.draw()
 
+        self.stop_distribution_animation(self.experimental_acceleration_distribution_analysis_ax)
         self.experimental_acceleration_distribution_analysis_ax.clear()
-        if start_analysis is not None and end_analysis is not None:
-            start_seg = next(i for i, t in enumerate(time_in_hours) if t >= start_analysis)
-            end_seg = next(i for i, t in enumerate(time_in_hours) if t >= end_analysis)
-            sliced_x, sliced_y, sliced_z = x[start_seg:end_seg], y[start_seg:end_seg], z[start_seg:end_seg]
-            path_vis_analysis = FibonacciLattice("experimental", sliced_x, sliced_y, sliced_z)
-            distribution_score_analysis = path_vis_analysis.getDistribution()
+        if window_path is not None:
+            sliced_x, sliced_y, sliced_z = window_path
             self.animate_distribution(
                 self.experimental_acceleration_distribution_analysis_ax,
                 self.experimental_acceleration_distribution_analysis_canvas,
                 sliced_x, sliced_y, sliced_z,
                 color='#ec1c24',
-                label=f"Distribution: {distribution_score_analysis}"
+                coverage_by_frame=window_coverage_by_frame
             )
         else:
             self.configure_3d_axes(self.experimental_acceleration_distribution_analysis_ax, "Orientation Distribution")
@@ -996,29 +1257,201 @@ class GUI:
 
     def start_simulation(self):
         try:
+            if self.compute_job is not None:
+                self.cancel_compute_job()
+                return
+
             if self.mode_var.get() == "Theoretical":
                 self.process_theoretical_data()
+                return
             elif self.mode_var.get() == "Experimental":
                 self.process_experimental_data_submission()
+            elif self.mode_var.get() == "Live":
+                self.toggle_live_acquisition()
 
-            self.last_start_analysis_theo = float(self.start_analysis_theo_entry.get()) if self.start_analysis_theo_entry.get() else None
-            self.last_end_analysis_theo = float(self.end_analysis_theo_entry.get()) if self.end_analysis_theo_entry.get() else None
-            self.last_start_analysis_exp = float(self.start_analysis_exp_entry.get()) if self.start_analysis_exp_entry.get() else None
-            self.last_end_analysis_exp = float(self.end_analysis_exp_entry.get()) if self.end_analysis_exp_entry.get() else None
-            self.last_mode = self.mode_var.get()
-            self.last_inner_velocity = float(self.inner_velocity_entry.get()) if self.inner_velocity_entry.get() else None
-            self.last_outer_velocity = float(self.outer_velocity_entry.get()) if self.outer_velocity_entry.get() else None
-            self.last_inner_position = float(self.inner_position_entry.get()) if self.inner_position_entry.get() else None
-            self.last_outer_position = float(self.outer_position_entry.get()) if self.outer_position_entry.get() else None
-            self.last_simulation_duration = float(self.simulation_duration_entry.get()) if self.simulation_duration_entry.get() else None
-            self.last_distance = float(self.distance_entry.get()) if self.distance_entry.get() else None
-            self.last_experimental_data = getattr(self, 'experimental_data', None)
+            self.remember_inputs(self.capture_inputs())
 
         except ValueError as ve:
             messagebox.showerror("Error", str(ve))
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
+    def capture_inputs(self):
+        return {
+            "last_start_analysis_theo": float(self.start_analysis_theo_entry.get()) if self.start_analysis_theo_entry.get() else None,
+            "last_end_analysis_theo": float(self.end_analysis_theo_entry.get()) if self.end_analysis_theo_entry.get() else None,
+            "last_start_analysis_exp": float(self.start_analysis_exp_entry.get()) if self.start_analysis_exp_entry.get() else None,
+            "last_end_analysis_exp": float(self.end_analysis_exp_entry.get()) if self.end_analysis_exp_entry.get() else None,
+            "last_mode": self.mode_var.get(),
+            "last_inner_velocity": float(self.inner_velocity_entry.get()) if self.inner_velocity_entry.get() else None,
+            "last_outer_velocity": float(self.outer_velocity_entry.get()) if self.outer_velocity_entry.get() else None,
+            "last_inner_position": float(self.inner_position_entry.get()) if self.inner_position_entry.get() else None,
+            "last_outer_position": float(self.outer_position_entry.get()) if self.outer_position_entry.get() else None,
+            "last_simulation_duration": float(self.simulation_duration_entry.get()) if self.simulation_duration_entry.get() else None,
+            "last_distance": float(self.distance_entry.get()) if self.distance_entry.get() else None,
+            "last_sample_interval": float(self.sample_interval_entry.get()) if self.sample_interval_entry.get() else "auto",
+            "last_experimental_data": getattr(self, 'experimental_data', None),
+        }
+
+    def remember_inputs(self, inputs):
+        for name, value in inputs.items():
+            setattr(self, name, value)
+
+    def start_compute_job(self, function, params, stages, on_done):
+        if self.compute_process is not None and self.compute_process.process.is_alive():
+            job = self.compute_process.submit(function, params, stages)
+        else:
+            job = ComputeJob(function, self.result_cache, params, stages=stages).start()
+        self.follow_compute_job(job, on_done)
+
+    def follow_compute_job(self, job, on_done, on_preview=None):
+        self.compute_job = job
+        self.start_button.config(text="Cancel")
+        self.master.after(JOB_POLL_MS, self.poll_compute_job, job, on_done, on_preview)
+
+    def poll_compute_job(self, job, on_done, on_preview=None):
+        if job is not self.compute_job:
+            # a superseded job is followed to the end, so shared memory from a result that arrives anyway is handed back
+            if not job.is_finished():
+                self.master.after(JOB_POLL_MS, self.poll_compute_job, job, on_done)
+            elif isinstance(job, ProcessJob) and job is not self.shared_results_job:
+                job.release()
+            return
+
+        stage, fraction = job.progress()
+        if not job.is_finished():
+            self.status_label.config(text=f"{stage}..." if stage else "")
+            self.progress_bar.config(value=fraction)
+            preview = job.take_preview() if on_preview is not None else None
+            if preview is not None:
+                on_preview(preview)
+            self.master.after(JOB_POLL_MS, self.poll_compute_job, job, on_done, on_preview)
+            return
+
+        self.finish_compute_job()
+        if job.status == "done":
+            try:
+                on_done(job.result)
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+            self.replace_shared_results(job)
+        elif job.status == "failed":
+            messagebox.showerror("Error", str(job.error))
+        elif job.status == "cancelled":
+            self.status_label.config(text="Cancelled")
+
+    def replace_shared_results(self, job):
+        # the plots keep views into the worker's shared memory, so the previous blocks are only returned once new results are drawn
+        if self.shared_results_job is not None:
+            self.shared_results_job.release()
+        self.shared_results_job = job if isinstance(job, ProcessJob) else None
+
+    def close(self):
+        self.stop_live_acquisition()
+        self.cancel_compute_job()
+        self.replace_shared_results(None)
+        if self.compute_process is not None:
+            self.compute_process.close()
+        self.master.destroy()
+
+    def cancel_compute_job(self):
+        if self.compute_job is not None:
+            self.compute_job.cancel()
+            self.finish_compute_job()
+            self.status_label.config(text="Cancelled")
+
+    def finish_compute_job(self):
+        self.compute_job = None
+        self.start_button.config(text="Start")
+        self.status_label.config(text="")
+        self.progress_bar.config(value=0)
+
+    def toggle_live_acquisition(self):
+        if self.live_acquisition is not None:
+            self.stop_live_acquisition()
+            return
+
+        source = create_source(self.live_source_var.get(), self.live_address_entry.get())
+        self.live_acquisition = LiveAcquisition(source)
+        self.live_acquisition.start()
+        self.start_button.config(text="Stop")
+        self.setup_live_plots()
+        self.live_refresh_job = self.master.after(LIVE_REFRESH_MS, self.refresh_live_plots)
+
+    def stop_live_acquisition(self):
+        if self.live_refresh_job is not None:
+            self.master.after_cancel(self.live_refresh_job)
+            self.live_refresh_job = None
+        if self.live_acquisition is not None:
+            self.live_acquisition.stop()
+            self.live_acquisition = None
+        self.start_button.config(text="Start")
+        self.status_label.config(text="")
+
+    def show_live_status(self, source):
+        if source.num_accepted == 0:
+            self.status_label.config(text="Waiting for samples...")
+        elif source.num_rejected:
+            self.status_label.config(text=f"{source.num_accepted} samples, {source.num_rejected} unrecognized lines skipped")
+        else:
+            self.status_label.config(text=f"{source.num_accepted} samples")
+
+    def refresh_live_plots(self):
+        self.live_refresh_job = None
+        try:
+            if self.live_acquisition.poll():
+                self.draw_live_plots(self.live_acquisition.result(), self.live_acquisition.recent_samples())
+            self.show_live_status(self.live_acquisition.source)
+        except Exception as e:
+            self.stop_live_acquisition()
+            messagebox.showerror("Error", str(e))
+            return
+        self.live_refresh_job = self.master.after(LIVE_REFRESH_MS, self.refresh_live_plots)
+
+    def setup_live_plots(self):
+        self.clear_experimental_plots()
+        left_ax = self.experimental_g_acceleration_ax_left
+        right_ax = self.experimental_g_acceleration_ax_right
+        distribution_ax = self.experimental_acceleration_distribution_ax
+
+        magnitude_line, = left_ax.plot([], [], color='#0066B2', label="Magnitude: 0")
+        left_ax.legend()
+        component_lines = (
+            right_ax.plot([], [], label='X', color='#6EAE39')[0],
+            right_ax.plot([], [], label='Y', color='#EF7A35')[0],
+            right_ax.plot([], [], label='Z', color='mediumorchid')[0],
+        )
+        right_ax.legend()
+        path_line, = distribution_ax.plot([], [], [], color='#0066b2', linewidth=1)
+        distribution_ax.legend(["Distribution: 0"])
+        self.live_artists = (magnitude_line, component_lines, path_line)
+
+    def draw_live_plots(self, result, recent_samples):
+        magnitude_line, component_lines, path_line = self.live_artists
+        left_ax = self.experimental_g_acceleration_ax_left
+        right_ax = self.experimental_g_acceleration_ax_right
+        distribution_ax = self.experimental_acceleration_distribution_ax
+
+        time_in_hours = result["time_in_hours"]
+        magnitude_line.set_data(time_in_hours, result["magnitude"])
+        left_ax.get_legend().get_texts()[0].set_text(f"Magnitude: {result['avg_g_magnitude']:.3g}")
+        for line, component in zip(component_lines, result["time_avg"]):
+            line.set_data(time_in_hours, component)
+        for ax in (left_ax, right_ax):
+            ax.relim()
+            ax.autoscale_view()
+
+        _, x, y, z = recent_samples
+        path_line.set_data_3d(x, y, z)
+        distribution_ax.get_legend().get_texts()[0].set_text(f"Distribution: {result['distribution']}")
+
+        # only the visible tab is rendered; the other catches up on the first refresh after it is selected
+        if self.notebook.select() == str(self.experimental_g_acceleration_frame):
+            self.experimental_g_acceleration_canvas_left.draw_idle()
+            self.experimental_g_acceleration_canvas_right.draw_idle()
+        else:
+            self.experimental_acceleration_distribution_canvas.draw_idle()
+
     def process_theoretical_data(self):
         start_analysis = self.start_analysis_theo_entry.get()
         end_analysis = self.end_analysis_theo_entry.get()
@@ -1043,82 +1476,127 @@ class GUI:
         theta_2_init = float(self.inner_position_entry.get()) if self.inner_position_entry.get() else 0.0
         theta_1_init = float(self.outer_position_entry.get()) if self.outer_position_entry.get() else 0.0
         delta_x, delta_y, delta_z = delta_cm, delta_cm, delta_cm
+        sample_interval = float(self.sample_interval_entry.get()) if self.sample_interval_entry.get() else "auto"
+        if sample_interval != "auto" and sample_interval <= 0:
+            raise ValueError("Sample interval must be > 0.")
+
+        params = {
+            "outer_rpm": outer_rpm, "inner_rpm": inner_rpm, "theta_1_init": theta_1_init, "theta_2_init": theta_2_init,
+            "delta_x": delta_x, "delta_y": delta_y, "delta_z": delta_z, "duration_hours": duration_hours,
+            "sample_interval": sample_interval, "start_analysis": start_analysis, "end_analysis": end_analysis,
+            "stop_at_convergence": self.stop_at_convergence_var.get(),
+        }
+        inputs = self.capture_inputs()
+        stages = CONVERGENCE_STAGES if params["stop_at_convergence"] else THEORETICAL_STAGES
+        self.start_compute_job(compute_theoretical_results, params, stages,
+                               lambda results: self.apply_theoretical_results(results, params, inputs))
+
+    def apply_theoretical_results(self, results, params, inputs):
+        cache_theoretical_results(self.result_cache, params, results)
+        time_array = results["time_array"]
+        start_analysis, end_analysis = params["start_analysis"], params["end_analysis"]
+        self.update_theoretical_g_acceleration_plot(time_array, results["g_magnitude"], results["avg_g_magnitude"], start_analysis, end_analysis,
+                                                    results["analysis_window"], results["avg_g_magnitude_analysis"])
+        self.update_theoretical_g_components_plot(time_array, *results["g_avg"])
+        self.update_theoretical_non_g_acceleration_plot(time_array, results["a_magnitude"], results["avg_a_magnitude"], start_analysis, end_analysis,
+                                                        results["analysis_window"], results["avg_a_magnitude_analysis"])
+        self.update_theoretical_non_g_components_plot(time_array, *results["a_avg"])
+        self.update_theoretical_acceleration_distribution_plot(results["a_tot_array"], results["distribution_score"], results["window_path"], results["window_coverage_by_frame"])
+        # a run stopped at convergence is exported over the shortened duration it was simulated for
+        self.remember_inputs(dict(inputs, last_simulation_duration=results["duration_hours"], last_analysis_window_theo=results["analysis_window"]))
+        status = f"Sample interval: {results['sample_step']:.3g} s, estimated error: {results['sample_error']:.2g} g"
+        if results["converged_at"] is not None:
+            status += f", converged at {results['converged_at']:.3g} h, stopped at {results['duration_hours']:.3g} h"
+        self.status_label.config(text=status)
+        if results["sample_error"] > results["sample_tolerance"]:
+            messagebox.showwarning(
+                "Warning",
+                f"The estimated sampling error of {results['sample_error']:.2g} g at a {results['sample_step']:.3g} s sample interval "
+                f"exceeds the {results['sample_tolerance']:.2g} g tolerance.\n\n"
+                "Enter a smaller sample interval for a more accurate result."
+            )
 
-        theoretical_model = MathModel(outer_rpm, inner_rpm, theta_1_init, theta_2_init, delta_x, delta_y, delta_z, duration_hours)
-        time_array, g_array, a_array, a_tot_array = theoretical_model.calculate_acceleration()
-
-        g_x_avg = np.cumsum(g_array[0]) / np.arange(1, len(g_array[0]) + 1)
-        g_y_avg = np.cumsum(g_array[1]) / np.arange(1, len(g_array[1]) + 1)
-        g_z_avg = np.cumsum(g_array[2]) / np.arange(1, len(g_array[2]) + 1)
-        g_magnitude = np.sqrt(g_x_avg**2 + g_y_avg**2 + g_z_avg**2)
-        avg_g_magnitude = np.mean(g_magnitude)
+    def get_theoretical_model_data(self, outer_rpm, inner_rpm, theta_1_init, theta_2_init, delta_x, delta_y, delta_z, duration_hours, sample_interval):
+        return theoretical_model_data(self.result_cache, outer_rpm, inner_rpm, theta_1_init, theta_2_init, delta_x, delta_y, delta_z, duration_hours, sample_interval)
 
-        a_x_avg = np.cumsum(a_array[0]) / np.arange(1, len(a_array[0]) + 1)
-        a_y_avg = np.cumsum(a_array[1]) / np.arange(1, len(a_array[1]) + 1)
-        a_z_avg = np.cumsum(a_array[2]) / np.arange(1, len(a_array[2]) + 1)
-        a_magnitude = np.sqrt(a_x_avg**2 + a_y_avg**2 + a_z_avg**2)
-        avg_a_magnitude = np.mean(a_magnitude)
+    def get_distribution_score(self, ID, x, y, z):
+        return distribution_score(self.result_cache, ID, x, y, z)
 
-        self.update_theoretical_g_acceleration_plot(time_array, g_magnitude, avg_g_magnitude)
-        self.update_theoretical_g_components_plot(time_array, g_x_avg, g_y_avg, g_z_avg)
-        self.update_theoretical_non_g_acceleration_plot(time_array, a_magnitude, avg_a_magnitude)
-        self.update_theoretical_non_g_components_plot(time_array, a_x_avg, a_y_avg, a_z_avg)
-        self.update_theoretical_acceleration_distribution_plot(a_tot_array, time_array)
+    def get_coverage_by_frame(self, x, y, z):
+        return coverage_by_frame(self.result_cache, x, y, z)
 
-    def update_theoretical_g_acceleration_plot(self, time_array, g_magnitude, avg_g_magnitude):
+    def update_theoretical_g_acceleration_plot(self, time_array, g_magnitude, avg_g_magnitude, start_analysis, end_analysis, analysis_window, avg_g_magnitude_analysis):
         time_in_hours = time_array / 3600
         self.theoretical_g_acceleration_ax.clear()
         self.theoretical_g_acceleration_ax.set_title("Time-Averaged Gravitational Acceleration")
-        self.theoretical_g_acceleration_ax.plot(time_in_hours, g_magnitude, color='#0066b2', label=f"Magnitude: {avg_g_magnitude:.3g}")
-
-        start_analysis = self.start_analysis_theo_entry.get()
-        end_analysis = self.end_analysis_theo_entry.get()
-        start_analysis = float(start_analysis) if start_analysis else None
-        end_analysis = float(end_analysis) if end_analysis else None
+        self.plot_time_series(self.theoretical_g_acceleration_ax, time_in_hours, g_magnitude, color='#0066b2', label=f"Magnitude: {avg_g_magnitude:.3g}")
 
         if start_analysis is not None and end_analysis is not None:
             self.theoretical_g_acceleration_ax.axvline(x=start_analysis, color='#EC1C24', linestyle='--')
             self.theoretical_g_acceleration_ax.axvline(x=end_analysis, color='#EC1C24', linestyle='--')
-            start_index = next(i for i, t in enumerate(time_in_hours) if t >= start_analysis)
-            end_index = next(i for i, t in enumerate(time_in_hours) if t >= end_analysis)
-            avg_g_magnitude_analysis = np.mean(g_magnitude[start_index:end_index])
-            self.theoretical_g_acceleration_ax.plot(time_in_hours[start_index:end_index], g_magnitude[start_index:end_index], color='#EC1C24', label=f"Magnitude: {avg_g_magnitude_analysis:.3g}")
+            start_index, end_index = analysis_window
+            self.plot_time_series(self.theoretical_g_acceleration_ax, time_in_hours[start_index:end_index], g_magnitude[start_index:end_index], color='#EC1C24', label=f"Magnitude: {avg_g_magnitude_analysis:.3g}")
 
+        self.plot_convergence_time(self.theoretical_g_acceleration_ax, convergence_time(time_in_hours, g_magnitude, DEFAULT_CONVERGENCE_THRESHOLD))
         self.theoretical_g_acceleration_ax.legend()
         self.theoretical_g_acceleration_ax.set_xlabel('Time (h)')
         self.theoretical_g_acceleration_ax.set_ylabel('Acceleration (g)')
         self.theoretical_g_acceleration_canvas.draw()
 
+    def plot_time_series(self, ax, x, y, **kwargs):
+        return self.plot_pyramid(ax, MinMaxPyramid(x, y), **kwargs)
+
+    def plot_pyramid(self, ax, pyramid, **kwargs):
+        pixel_width = ax.get_window_extent().width
+        line, = ax.plot(*pyramid.query(-np.inf, np.inf, pixel_width), **kwargs)
+        self.detail_pyramids[line] = pyramid
+        # ax.clear() drops these callbacks together with the lines they refresh
+        ax.callbacks.connect('xlim_changed', lambda ax, line=line: self.refresh_line_detail(ax, line))
+        return line
+
+    def refresh_line_detail(self, ax, line):
+        pyramid = self.detail_pyramids.get(line)
+        if pyramid is not None:
+            line.set_data(*pyramid.query(*ax.get_xlim(), ax.get_window_extent().width))
+
+    def get_experimental_export_data(self, lines, *names):
+        # plots streamed from a CSV are decimated, so a recording of that CSV supplies the exported samples
+        if isinstance(self.last_experimental_data, AccelerometerRecording):
+            return (self.last_experimental_data.time_in_hours,) + tuple(getattr(self.last_experimental_data, name) for name in names)
+        line_data = [self.get_line_data(line) for line in lines]
+        return (line_data[0][0],) + tuple(y_data for _, y_data in line_data)
+
+    def get_line_data(self, line):
+        pyramid = self.detail_pyramids.get(line)
+        return pyramid.data() if pyramid is not None else line.get_data()
+
+    def plot_convergence_time(self, ax, converged_at):
+        if converged_at is not None and not np.isnan(converged_at):
+            ax.axvline(x=converged_at, color='#5B616B', linestyle=':', label=f"< {DEFAULT_CONVERGENCE_THRESHOLD:g} g: {converged_at:.3g} h")
+
     def update_theoretical_g_components_plot(self, time_array, g_x_avg, g_y_avg, g_z_avg):
         time_in_hours = time_array / 3600
         self.theoretical_g_components_ax.clear()
         self.theoretical_g_components_ax.set_title("Time-Averaged Gravitational Acceleration")
-        self.theoretical_g_components_ax.plot(time_in_hours, g_x_avg, label='X', color='#6EAE39')
-        self.theoretical_g_components_ax.plot(time_in_hours, g_y_avg, label='Y', color='#EF7A35')
-        self.theoretical_g_components_ax.plot(time_in_hours, g_z_avg, label='Z', color='mediumorchid')
+        self.plot_time_series(self.theoretical_g_components_ax, time_in_hours, g_x_avg, label='X', color='#6EAE39')
+        self.plot_time_series(self.theoretical_g_components_ax, time_in_hours, g_y_avg, label='Y', color='#EF7A35')
+        self.plot_time_series(self.theoretical_g_components_ax, time_in_hours, g_z_avg, label='Z', color='mediumorchid')
         self.theoretical_g_components_ax.legend()
         self.theoretical_g_components_ax.set_xlabel('Time (h)')
         self.theoretical_g_components_ax.set_ylabel('Acceleration (g)')
         self.theoretical_g_components_canvas.draw()
 
-    def update_theoretical_non_g_acceleration_plot(self, time_array, a_magnitude, avg_a_magnitude):
+    def update_theoretical_non_g_acceleration_plot(self, time_array, a_magnitude, avg_a_magnitude, start_analysis, end_analysis, analysis_window, avg_a_magnitude_analysis):
         time_in_hours = time_array / 3600
         self.theoretical_non_g_acceleration_ax.clear()
         self.theoretical_non_g_acceleration_ax.set_title("Time-Averaged Non-Gravitational Acceleration")
-        self.theoretical_non_g_acceleration_ax.plot(time_in_hours, a_magnitude, color='#0066b2', label=f"Magnitude: {avg_a_magnitude:.3g}")
-
-        start_analysis = self.start_analysis_theo_entry.get()
-        end_analysis = self.end_analysis_theo_entry.get()
-        start_analysis = float(start_analysis) if start_analysis else None
-        end_analysis = float(end_analysis) if end_analysis else None
+        self.plot_time_series(self.theoretical_non_g_acceleration_ax, time_in_hours, a_magnitude, color='#0066b2', label=f"Magnitude: {avg_a_magnitude:.3g}")
 
         if start_analysis is not None and end_analysis is not None:
             self.theoretical_non_g_acceleration_ax.axvline(x=start_analysis, color='#EC1C24', linestyle='--')
             self.theoretical_non_g_acceleration_ax.axvline(x=end_analysis, color='#EC1C24', linestyle='--')
-            start_index = next(i for i, t in enumerate(time_in_hours) if t >= start_analysis)
-            end_index = next(i for i, t in enumerate(time_in_hours) if t >= end_analysis)
-            avg_a_magnitude_analysis = np.mean(a_magnitude[start_index:end_index])
-            self.theoretical_non_g_acceleration_ax.plot(time_in_hours[start_index:end_index], a_magnitude[start_index:end_index], color='#EC1C24', label=f"Magnitude: {avg_a_magnitude_analysis:.3g}")
+            start_index, end_index = analysis_window
+            self.plot_time_series(self.theoretical_non_g_acceleration_ax, time_in_hours[start_index:end_index], a_magnitude[start_index:end_index], color='#EC1C24', label=f"Magnitude: {avg_a_magnitude_analysis:.3g}")
 
         self.theoretical_non_g_acceleration_ax.legend()
         self.theoretical_non_g_acceleration_ax.set_xlabel('Time (h)')
@@ -1129,41 +1607,31 @@ class GUI:
         time_in_hours = time_array / 3600
         self.theoretical_non_g_components_ax.clear()
         self.theoretical_non_g_components_ax.set_title("Time-Averaged Non-Gravitational Acceleration")
-        self.theoretical_non_g_components_ax.plot(time_in_hours, a_x_avg, label='X', color='#6EAE39')
-        self.theoretical_non_g_components_ax.plot(time_in_hours, a_y_avg, label='Y', color='#EF7A35')
-        self.theoretical_non_g_components_ax.plot(time_in_hours, a_z_avg, label='Z', color='mediumorchid')
+        self.plot_time_series(self.theoretical_non_g_components_ax, time_in_hours, a_x_avg, label='X', color='#6EAE39')
+        self.plot_time_series(self.theoretical_non_g_components_ax, time_in_hours, a_y_avg, label='Y', color='#EF7A35')
+        self.plot_time_series(self.theoretical_non_g_components_ax, time_in_hours, a_z_avg, label='Z', color='mediumorchid')
         self.theoretical_non_g_components_ax.legend()
         self.theoretical_non_g_components_ax.set_xlabel('Time (h)')
         self.theoretical_non_g_components_ax.set_ylabel('Acceleration (g)')
         self.theoretical_non_g_components_canvas.draw()
 
-    def update_theoretical_acceleration_distribution_plot(self, a_tot_array, time_array):
+    def update_theoretical_acceleration_distribution_plot(self, a_tot_array, distribution_score, window_path, window_coverage_by_frame):
         self.theoretical_acceleration_distribution_ax.clear()
         self.theoretical_acceleration_distribution_ax.plot(a_tot_array[0], a_tot_array[1], a_tot_array[2], color='#0066b2', linewidth=1)
         self.configure_3d_axes(self.theoretical_acceleration_distribution_ax, "Orientation Distribution")
-        distribution_score = FibonacciLattice("theoretical", a_tot_array[0], a_tot_array[1], a_tot_array[2]).getDistribution()
         self.theoretical_acceleration_distribution_ax.legend([f"Distribution: {distribution_score}"])
         self.theoretical_acceleration_distribution_canvas.draw()
 
+        self.stop_distribution_animation(self.theoretical_acceleration_distribution_analysis_ax)
         self.theoretical_acceleration_distribution_analysis_ax.clear()
-        start_analysis = self.start_analysis_theo_entry.get()
-        end_analysis = self.end_analysis_theo_entry.get()
-        start_analysis = float(start_analysis) if start_analysis else None
-        end_analysis = float(end_analysis) if end_analysis else None
-
-        if start_analysis is not None and end_analysis is not None:
-            time_in_hours = time_array / 3600
-            start_index = next(i for i, t in enumerate(time_in_hours) if t >= start_analysis)
-            end_index = next(i for i, t in enumerate(time_in_hours) if t >= end_analysis)
-            sliced_x, sliced_y, sliced_z = a_tot_array[0][start_index:end_index], a_tot_array[1][start_index:end_index], a_tot_array[2][start_index:end_index]
-            path_vis_analysis = FibonacciLattice("theoretical", sliced_x, sliced_y, sliced_z)
-            distribution_score_analysis = path_vis_analysis.getDistribution()
+        if window_path is not None:
+            sliced_x, sliced_y, sliced_z = window_path
             self.animate_distribution(
                 self.theoretical_acceleration_distribution_analysis_ax,
                 self.theoretical_acceleration_distribution_analysis_canvas,
                 sliced_x, sliced_y, sliced_z,
                 color='#ec1c24',
-                label=f"Distribution: {distribution_score_analysis}"
+                coverage_by_frame=window_coverage_by_frame
             )
         else:
             self.configure_3d_axes(self.theoretical_acceleration_distribution_analysis_ax, "Orientation Distribution")
@@ -1172,43 +1640,8 @@ class GUI:
     def open_url(self, url):
         webbrowser.open_new(url)
 
-def import_sci_spinner_format_data(file_path):
-    try:
-        time_in_seconds = []
-        x = []
-        y = []
-        z = []
-
-        with open(file_path, 'r') as file:
-            csv_reader = csv.DictReader(file)
-            for row in csv_reader:
-                time_in_seconds.append(float(row['timestamp']))
-                x.append(float(row['x_acc']))
-                y.append(float(row['y_acc']))
-                z.append(float(row['z_acc']))
-
-        time_in_hours = [t / 3600 for t in time_in_seconds]
-
-        def normalize_vectors(x, y, z):
-            g_const = 9.80665
-            normalized_x = np.array(x) / g_const
-            normalized_y = np.array(y) / g_const
-            normalized_z = np.array(z) / g_const
-            return normalized_x, normalized_y, normalized_z
-
-        x, y, z = normalize_vectors(x, y, z)
-        return time_in_hours, x, y, z
-
-    except KeyError:
-        raise ValueError(
-            "Error",
-            "Invalid CSV file format.\n\n"
-            "Supported CSV file formats:\n"
-            "(1) Timestamp (yyyy-mm-dd hh:mm:ss.sss), X (g), Y (g), Z (g)\n"
-            "(2) Timestamp (s), X (m/s²), Y (m/s²), Z (m/s²)"
-        )
-
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     root = tk.Tk()
     gui = GUI(root)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,243 @@
+import os
+import socket
+import threading
+import time
+from collections import deque
+import numpy as np
+from accelerometer_data import SCI_SPINNER_COLUMNS, STANDARD_GRAVITY, SUPPORTED_FORMATS, find_sci_spinner_columns, parse_timestamp_columns
+from streaming import AccelerometerStreamingAnalysis
+
+try:
+    import smbus2
+except ImportError:
+    smbus2 = None
+
+DEFAULT_RING_CAPACITY = 4096
+DEFAULT_LIVE_PLOT_POINTS = 2000
+DEFAULT_I2C_SAMPLE_RATE = 100.0
+ADXL345_ADDRESS = 0x53
+ADXL345_POWER_REGISTER = 0x2D
+ADXL345_FORMAT_REGISTER = 0x31
+ADXL345_DATA_REGISTER = 0x32
+ADXL345_SCALE = 0.0039
+POLL_INTERVAL = 0.05
+MAX_REJECTED_LINES = 20
+
+def parse_sample_line(line, sci_spinner_columns=None):
+    fields = line.replace(',', ' ').split()
+    # the same two layouts the CSV importers accept: Sci-Spinner seconds and m/s², or a timestamp and g
+    if sci_spinner_columns is not None or len(fields) == 4:
+        time_in_seconds, x, y, z = (float(fields[i]) for i in (sci_spinner_columns or range(4)))
+        return time_in_seconds, x / STANDARD_GRAVITY, y / STANDARD_GRAVITY, z / STANDARD_GRAVITY
+    if len(fields) == 5:
+        try:
+            timestamp = parse_timestamp_columns([fields[0]], [fields[1]])[0]
+        except (ValueError, OverflowError):
+            raise ValueError(f"Unrecognized sample: {line!r}")
+        return timestamp.astype(np.int64) / 1e6, float(fields[2]), float(fields[3]), float(fields[4])
+    raise ValueError(f"Unrecognized sample: {line!r}")
+
+def parse_header_line(line):
+    fields = line.replace(',', ' ').split()
+    if all(name in fields for name in SCI_SPINNER_COLUMNS):
+        return find_sci_spinner_columns(fields)
+    return None
+
+class RingBuffer:
+    def __init__(self, capacity, num_columns):
+        self.capacity = capacity
+        self.data = np.zeros((num_columns, capacity))
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, block):
+        block = block[:, -self.capacity:]
+        num_new = block.shape[1]
+        end = self.head + num_new
+        if end <= self.capacity:
+            self.data[:, self.head:end] = block
+        else:
+            split = self.capacity - self.head
+            self.data[:, self.head:] = block[:, :split]
+            self.data[:, :end - self.capacity] = block[:, split:]
+        self.head = end % self.capacity
+        self.count = min(self.count + num_new, self.capacity)
+
+    def get(self):
+        if self.count < self.capacity:
+            return self.data[:, :self.count]
+        return np.hstack((self.data[:, self.head:], self.data[:, :self.head]))
+
+class SampleSource:
+    def __init__(self):
+        self.samples = deque()
+        self.running = False
+        self.thread = None
+        self.error = None
+        self.sci_spinner_columns = None
+        self.num_accepted = 0
+        self.num_rejected = 0
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1.0)
+
+    def run(self):
+        try:
+            self.acquire()
+        except Exception as e:
+            self.error = e
+            self.running = False
+
+    def acquire(self):
+        raise NotImplementedError
+
+    def add_sample(self, sample):
+        self.samples.append(sample)
+        self.num_accepted += 1
+
+    def add_line(self, line):
+        if not line.strip():
+            return
+        header = parse_header_line(line)
+        if header is not None:
+            self.sci_spinner_columns = header
+            return
+        try:
+            sample = parse_sample_line(line, self.sci_spinner_columns)
+        except (ValueError, IndexError):
+            self.num_rejected += 1
+            # a few bad lines are skipped, but a source that has never sent a valid one is in the wrong format
+            if self.num_accepted == 0 and self.num_rejected >= MAX_REJECTED_LINES:
+                raise ValueError("Invalid live sample format.\n\nSupported sample formats:\n" + SUPPORTED_FORMATS)
+            return
+        self.add_sample(sample)
+
+    def read(self):
+        samples = [self.samples.popleft() for _ in range(len(self.samples))]
+        if not samples and self.error is not None:
+            raise self.error
+        return np.array(samples, dtype=float).reshape(-1, 4).T
+
+class I2CSource(SampleSource):
+    def __init__(self, bus_number=1, address=ADXL345_ADDRESS, sample_rate=DEFAULT_I2C_SAMPLE_RATE):
+        super().__init__()
+        if smbus2 is None:
+            raise ValueError("smbus2 is required for I2C acquisition.")
+        self.bus_number = bus_number
+        self.address = address
+        self.sample_rate = sample_rate
+
+    def acquire(self):
+        with smbus2.SMBus(self.bus_number) as bus:
+            bus.write_byte_data(self.address, ADXL345_FORMAT_REGISTER, 0x08)
+            bus.write_byte_data(self.address, ADXL345_POWER_REGISTER, 0x08)
+            start_time = time.monotonic()
+            next_time = start_time
+            while self.running:
+                raw = bus.read_i2c_block_data(self.address, ADXL345_DATA_REGISTER, 6)
+                x, y, z = np.frombuffer(bytes(raw), dtype='<i2') * ADXL345_SCALE
+                self.add_sample((time.monotonic() - start_time, x, y, z))
+                next_time += 1.0 / self.sample_rate
+                time.sleep(max(0.0, next_time - time.monotonic()))
+
+class SocketSource(SampleSource):
+    def __init__(self, host, port):
+        super().__init__()
+        self.host = host
+        self.port = port
+
+    def acquire(self):
+        with socket.create_connection((self.host, self.port), timeout=POLL_INTERVAL * 20) as connection:
+            connection.settimeout(POLL_INTERVAL)
+            pending = b""
+            while self.running:
+                try:
+                    data = connection.recv(65536)
+                except socket.timeout:
+                    continue
+                if not data:
+                    self.add_line(pending.decode(errors="replace"))
+                    raise ConnectionError("The live source closed the connection.")
+                *lines, pending = (pending + data).split(b"\n")
+                for line in lines:
+                    self.add_line(line.decode(errors="replace"))
+
+class TailFileSource(SampleSource):
+    def __init__(self, file_path, from_start=True):
+        super().__init__()
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError(f"File not found: {file_path}")
+        self.file_path = file_path
+        self.from_start = from_start
+
+    def acquire(self):
+        with open(self.file_path, 'r') as file:
+            if not self.from_start:
+                file.seek(0, os.SEEK_END)
+            pending = ""
+            while self.running:
+                line = file.readline()
+                if not line:
+                    time.sleep(POLL_INTERVAL)
+                    continue
+                pending += line
+                if pending.endswith("\n"):
+                    self.add_line(pending)
+                    pending = ""
+
+def create_source(kind, address):
+    address = address.strip()
+    if kind == "I2C":
+        bus_number, _, device = (address or "1").partition(":")
+        return I2CSource(int(bus_number), int(device, 0) if device else ADXL345_ADDRESS)
+    if not address:
+        raise ValueError("Set the live source address.")
+    if kind == "Socket":
+        host, _, port = address.rpartition(":")
+        if not host or not port.isdigit():
+            raise ValueError("Socket address must be host:port.")
+        return SocketSource(host, int(port))
+    if kind == "File":
+        return TailFileSource(address)
+    raise ValueError(f"Unknown live source: {kind}")
+
+class LiveAcquisition:
+    def __init__(self, source, capacity=DEFAULT_RING_CAPACITY, max_plot_points=DEFAULT_LIVE_PLOT_POINTS, num_points=1000):
+        self.source = source
+        self.buffer = RingBuffer(capacity, 4)
+        self.analysis = AccelerometerStreamingAnalysis("live", num_points=num_points, max_plot_points=max_plot_points)
+        self.origin = None
+
+    def start(self):
+        self.source.start()
+
+    def stop(self):
+        self.source.stop()
+
+    def poll(self):
+        time_in_seconds, x, y, z = self.source.read()
+        if time_in_seconds.size == 0:
+            return 0
+
+        if self.origin is None:
+            self.origin = time_in_seconds[0]
+        time_in_hours = (time_in_seconds - self.origin) / 3600
+        self.buffer.append(np.vstack((time_in_hours, x, y, z)))
+        self.analysis.update(time_in_hours, x, y, z)
+        return time_in_hours.size
+
+    def recent_samples(self):
+        return self.buffer.get()
+
+    def result(self):
+        return self.analysis.result()
@@ -1,8 +1,39 @@
 import numpy as np
 import math as m
+from fractions import Fraction
+from fibonacci_lattice import FibonacciLattice, getLatticeGeometry
+
+MODEL_VERSION = 1
+BYTES_PER_SAMPLE = 160
+DEFAULT_SAMPLE_INTERVAL = 0.1
+MAX_SAMPLE_INTERVAL = 60.0
+DEFAULT_TOLERANCE = 1e-3
+MAX_ANGULAR_STEP = 0.005
+MAX_RPM_DENOMINATOR = 1000
+DEFAULT_BLOCK_BYTES = 64 * 1024 * 1024
+
+SWEEP_RESULT_DTYPE = np.dtype([
+    ('omega_alpha_rpm', 'f8'),
+    ('omega_beta_rpm', 'f8'),
+    ('alpha_0_deg', 'f8'),
+    ('beta_0_deg', 'f8'),
+    ('x', 'f8'),
+    ('y', 'f8'),
+    ('z', 'f8'),
+    ('duration_hours', 'f8'),
+    ('g_magnitude_final', 'f8'),
+    ('g_magnitude_mean', 'f8'),
+    ('a_magnitude_final', 'f8'),
+    ('a_magnitude_mean', 'f8'),
+    ('distribution', 'i8'),
+])
+
+def lcm_fraction(a, b):
+    return Fraction(m.lcm(a.numerator, b.numerator), m.gcd(a.denominator, b.denominator))
 
 class MathModel:
-    def __init__(self, omega_alpha_rpm, omega_beta_rpm, alpha_0_deg, beta_0_deg, x, y, z, duration_hours):
+    def __init__(self, omega_alpha_rpm, omega_beta_rpm, alpha_0_deg, beta_0_deg, x, y, z, duration_hours,
+                 sample_interval=DEFAULT_SAMPLE_INTERVAL, tolerance=DEFAULT_TOLERANCE, period_seconds=None):
         self.omega_alpha_rpm = omega_alpha_rpm  
         self.omega_beta_rpm = omega_beta_rpm
         self.alpha_0 = alpha_0_deg
@@ -11,6 +42,11 @@ class MathModel:
         self.y = y / 100   
         self.z = z / 100    
         self.duration_hours = duration_hours 
+        self.period_seconds = period_seconds
+        self.tolerance = tolerance
+        if isinstance(sample_interval, str) and sample_interval == "auto":
+            sample_interval = self.auto_sample_interval(tolerance)
+        self.sample_interval = sample_interval
     
     def rpm_to_rad_sec(self, rpm):
         return rpm * np.pi / 30
@@ -18,60 +54,270 @@ class MathModel:
     def deg_to_rad(self, degrees):
         return np.radians(degrees)
 
-    def calculate_acceleration(self):
+    def sampling_error_coefficient(self):
+        omega_alpha = np.abs(self.rpm_to_rad_sec(self.omega_alpha_rpm))
+        omega_beta = np.abs(self.rpm_to_rad_sec(self.omega_beta_rpm))
+        radius = np.sqrt(self.x**2 + self.y**2 + self.z**2)
+        a_amplitude = radius * (2 * (omega_alpha**2 + omega_beta**2) + omega_alpha * omega_beta) / 9.8
+        # g oscillates at up to w_a + w_b with unit amplitude, a at up to 2 w_b.
+        return ((omega_alpha + omega_beta)**2 + a_amplitude * (2 * omega_beta)**2) / 8
+
+    def estimate_sample_error(self, sample_interval=None):
+        if sample_interval is None:
+            sample_interval = self.time_step()
+        return self.sampling_error_coefficient() * sample_interval**2
+
+    def auto_sample_interval(self, tolerance=DEFAULT_TOLERANCE):
+        coefficient = self.sampling_error_coefficient()
+        sample_interval = m.sqrt(tolerance / coefficient) if coefficient > 0 else MAX_SAMPLE_INTERVAL
+        # Larger steps let the path skip lattice cells and lower the distribution score.
+        omega_total = abs(self.rpm_to_rad_sec(self.omega_alpha_rpm)) + abs(self.rpm_to_rad_sec(self.omega_beta_rpm))
+        if omega_total > 0:
+            sample_interval = min(sample_interval, MAX_ANGULAR_STEP / omega_total)
+        sample_interval = min(max(sample_interval, DEFAULT_SAMPLE_INTERVAL), MAX_SAMPLE_INTERVAL)
+        end_time_in_seconds = int(self.duration_hours * 3600)
+        if end_time_in_seconds > 0:
+            sample_interval = end_time_in_seconds / m.ceil(end_time_in_seconds / sample_interval)
+        return sample_interval
+
+    def num_samples(self):
+        end_time_in_seconds = int(self.duration_hours * 3600)
+        return m.floor(end_time_in_seconds / self.sample_interval) + 1
+
+    def time_step(self):
+        end_time_in_seconds = int(self.duration_hours * 3600)
+        num_samples = self.num_samples()
+        return end_time_in_seconds / (num_samples - 1) if num_samples > 1 else 0.0
+
+    def rpm_to_fraction(self, rpm):
+        fraction = Fraction(rpm).limit_denominator(MAX_RPM_DENOMINATOR)
+        if abs(float(fraction) - rpm) > 1e-9 * max(1.0, abs(rpm)):
+            return None
+        return fraction
+
+    def period_samples(self):
+        num_samples = self.num_samples()
+        if num_samples < 2:
+            return None
+        end_time_in_seconds = int(self.duration_hours * 3600)
+        time_step = Fraction(end_time_in_seconds, num_samples - 1)
+
+        if self.period_seconds is not None:
+            period = Fraction(self.period_seconds).limit_denominator(MAX_RPM_DENOMINATOR)
+        else:
+            period = time_step
+            for rpm in (self.omega_alpha_rpm, self.omega_beta_rpm):
+                if rpm == 0:
+                    continue
+                rpm_fraction = self.rpm_to_fraction(rpm)
+                if rpm_fraction is None:
+                    return None
+                period = lcm_fraction(period, Fraction(60) / abs(rpm_fraction))
+
+        period = lcm_fraction(period, time_step)
+        samples = period / time_step
+        if samples.denominator != 1 or samples.numerator >= num_samples:
+            return None
+        return samples.numerator
+
+    def calculate_period(self):
+        samples = self.period_samples()
+        return None if samples is None else samples * self.time_step()
+
+    def calculate_period_acceleration(self):
+        samples = self.period_samples()
+        if samples is None:
+            return None
+        return self.calculate_acceleration_at(np.arange(samples) * self.time_step())
+
+    @staticmethod
+    def extend_running_average(period_array, num_samples):
+        period_samples = period_array.shape[-1]
+        period_cumsum = np.cumsum(period_array, axis=-1)
+        sample_index = np.arange(num_samples)
+        periods, offsets = np.divmod(sample_index, period_samples)
+        return (periods * period_cumsum[..., -1:] + period_cumsum[..., offsets]) / (sample_index + 1)
+
+    @staticmethod
+    def take_periodic(period_array, start, stop):
+        return np.take(period_array, np.arange(start, stop) % period_array.shape[-1], axis=-1)
+
+    def calculate_time_array(self):
         end_time_in_seconds = int(self.duration_hours * 3600) 
-        time_array = np.linspace(0, end_time_in_seconds, m.floor(end_time_in_seconds / 0.1) + 1)
+        return np.linspace(0, end_time_in_seconds, self.num_samples())
+
+    def calculate_acceleration(self):
+        return self.calculate_acceleration_at(self.calculate_time_array())
 
+    def iterate_acceleration(self, block_size=None, max_block_bytes=DEFAULT_BLOCK_BYTES, reuse_buffers=False):
+        if block_size is None:
+            block_size = max(1, max_block_bytes // BYTES_PER_SAMPLE)
+        num_samples = self.num_samples()
+        time_step = self.time_step()
+
+        if reuse_buffers:
+            block_size = min(block_size, num_samples)
+            index_buffer = np.arange(block_size, dtype=float)
+            time_buffer = np.empty(block_size)
+            out_buffer = np.empty((3, 3, block_size))
+
+        for start in range(0, num_samples, block_size):
+            stop = min(start + block_size, num_samples)
+            if reuse_buffers:
+                time_block = time_buffer[:stop - start]
+                np.add(index_buffer[:stop - start], start, out=time_block)
+                time_block *= time_step
+                yield self.calculate_acceleration_at(time_block, out=out_buffer[:, :, :stop - start])
+            else:
+                time_block = np.arange(start, stop) * time_step
+                yield self.calculate_acceleration_at(time_block)
+
+    @classmethod
+    def sweep(cls, omega_alpha_rpm, omega_beta_rpm, alpha_0_deg=0.0, beta_0_deg=0.0, x=0.0, y=0.0, z=0.0, duration_hours=1.0,
+              sample_interval=DEFAULT_SAMPLE_INTERVAL, block_size=None, max_block_bytes=DEFAULT_BLOCK_BYTES, score_distribution=True, num_points=1000):
+        params = np.broadcast_arrays(*[np.asarray(p, dtype=float) for p in (omega_alpha_rpm, omega_beta_rpm, alpha_0_deg, beta_0_deg, x, y, z, duration_hours)])
+        shape = params[0].shape
+        columns = [p.reshape(-1, 1) for p in params]
+        num_conditions = columns[0].shape[0]
+
+        results = np.zeros(num_conditions, dtype=SWEEP_RESULT_DTYPE)
+        for name, column in zip(SWEEP_RESULT_DTYPE.names, columns):
+            results[name] = column[:, 0]
+        if num_conditions == 0:
+            return results.reshape(shape)
+
+        model = cls(*columns)
+        end_times = (model.duration_hours * 3600).astype(int)[:, 0]
+        sample_intervals = np.broadcast_to(np.asarray(sample_interval, dtype=float), shape).ravel()
+        sample_counts = np.floor(end_times / sample_intervals).astype(int) + 1
+        time_steps = np.where(sample_counts > 1, end_times / np.maximum(sample_counts - 1, 1), 0.0)[:, None]
+
+        if block_size is None:
+            block_size = max(1, max_block_bytes // (BYTES_PER_SAMPLE * num_conditions))
+        block_size = min(block_size, sample_counts.max())
+        out_buffer = np.empty((3, 3, num_conditions, block_size))
+
+        g_sum = np.zeros((3, num_conditions))
+        a_sum = np.zeros((3, num_conditions))
+        g_magnitude_sum = np.zeros(num_conditions)
+        a_magnitude_sum = np.zeros(num_conditions)
+        coverage = np.zeros((num_conditions, 0), dtype=bool)
+        geometry = getLatticeGeometry(num_points)
+
+        for start in range(0, sample_counts.max(), block_size):
+            stop = min(start + block_size, sample_counts.max())
+            sample_index = np.arange(start, stop)
+            valid = sample_index < sample_counts[:, None]
+            time_block = sample_index * time_steps
+            _, g_block, a_block, a_tot_block = model.calculate_acceleration_at(time_block, out=out_buffer[..., :stop - start])
+            g_block *= valid
+            a_block *= valid
+
+            counts = sample_index + 1
+            g_avg = (np.cumsum(g_block, axis=-1) + g_sum[..., None]) / counts
+            a_avg = (np.cumsum(a_block, axis=-1) + a_sum[..., None]) / counts
+            g_magnitude_sum += (np.sqrt((g_avg**2).sum(axis=0)) * valid).sum(axis=-1)
+            a_magnitude_sum += (np.sqrt((a_avg**2).sum(axis=0)) * valid).sum(axis=-1)
+            g_sum += g_block.sum(axis=-1)
+            a_sum += a_block.sum(axis=-1)
+
+            if score_distribution:
+                conditions, samples = np.nonzero(valid)
+                cell_ids = FibonacciLattice("sweep", a_tot_block[0, conditions, samples], a_tot_block[1, conditions, samples], a_tot_block[2, conditions, samples], num_points).getCellIds()
+                num_cells = len(geometry.cellIndex)
+                if num_cells > coverage.shape[1]:
+                    coverage = np.pad(coverage, ((0, 0), (0, num_cells - coverage.shape[1])))
+                coverage[conditions, cell_ids] = True
+
+        results['g_magnitude_final'] = np.sqrt(((g_sum / sample_counts)**2).sum(axis=0))
+        results['g_magnitude_mean'] = g_magnitude_sum / sample_counts
+        results['a_magnitude_final'] = np.sqrt(((a_sum / sample_counts)**2).sum(axis=0))
+        results['a_magnitude_mean'] = a_magnitude_sum / sample_counts
+        results['distribution'] = coverage.sum(axis=1) if score_distribution else -1
+        return results.reshape(shape)
+
+    def calculate_acceleration_at(self, time_array, out=None):
         omega_alpha = self.rpm_to_rad_sec(self.omega_alpha_rpm) 
         omega_beta = self.rpm_to_rad_sec(self.omega_beta_rpm)
 
         alpha_0 = self.deg_to_rad(self.alpha_0)
         beta_0 = self.deg_to_rad(self.beta_0)  
 
-        alpha_t = omega_alpha * time_array + alpha_0
-        beta_t = omega_beta * time_array + beta_0
+        if out is None:
+            out = np.empty((3, 3, time_array.size))
+        g_local_2, a_local_2, a_tot_local_2 = out
+
+        sin_beta, cos_beta, scratch = a_tot_local_2
+
+        # Angles and their sines/cosines are evaluated once, using a_tot as scratch space.
+        np.multiply(time_array, omega_alpha, out=sin_beta)
+        sin_beta += alpha_0
+        np.sin(sin_beta, out=g_local_2[1])
+        np.cos(sin_beta, out=scratch)
+
+        np.multiply(time_array, omega_beta, out=cos_beta)
+        cos_beta += beta_0
+        np.sin(cos_beta, out=sin_beta)
+        np.cos(cos_beta, out=cos_beta)
+
+        # g_local = R_y^T R_x^T g = (-sin(beta) cos(alpha), sin(alpha), cos(beta) cos(alpha))
+        np.multiply(sin_beta, scratch, out=g_local_2[0])
+        np.negative(g_local_2[0], out=g_local_2[0])
+        np.multiply(cos_beta, scratch, out=g_local_2[2])
+
+        # In the sample frame omega = (w_a cos(beta), w_b, w_a sin(beta)) and
+        # omega_dot = w_a w_b (-sin(beta), 0, cos(beta)), so
+        # a_local = -(omega_dot x r + omega (omega . r) - r |omega|^2) with r = (x, y, z).
+        omega_squared = omega_alpha**2 + omega_beta**2
+        omega_product = omega_alpha * omega_beta
+
+        np.multiply(cos_beta, omega_alpha * self.x, out=scratch)
+        np.multiply(sin_beta, omega_alpha * self.z, out=a_local_2[0])
+        scratch += a_local_2[0]
+        scratch += omega_beta * self.y
 
-        omega_tot = np.array([
-            omega_alpha * np.ones_like(time_array),          
-            omega_beta * np.cos(alpha_t),                   
-            omega_beta * np.sin(alpha_t)                    
-        ]) 
+        np.multiply(cos_beta, omega_product * self.x, out=a_local_2[1])
+        np.multiply(sin_beta, omega_product * self.z, out=a_local_2[0])
+        a_local_2[1] += a_local_2[0]
+        np.multiply(scratch, omega_beta, out=a_local_2[0])
+        a_local_2[1] += a_local_2[0]
+        np.subtract(self.y * omega_squared, a_local_2[1], out=a_local_2[1])
 
-        omega_tot_dot = np.array([
-            np.zeros_like(time_array),                        
-            -omega_alpha * omega_beta * np.sin(alpha_t),  
-            omega_alpha * omega_beta * np.cos(alpha_t)   
-        ])  
+        scratch *= -omega_alpha
+        scratch += omega_product * self.y
+        np.multiply(cos_beta, scratch, out=a_local_2[0])
+        a_local_2[0] += self.x * omega_squared
+        np.multiply(sin_beta, scratch, out=a_local_2[2])
+        a_local_2[2] += self.z * omega_squared
 
-        r = np.array([
-            self.x * np.cos(beta_t) + self.z * np.sin(beta_t),
-            self.y * np.cos(alpha_t) + self.x * np.sin(alpha_t) * np.sin(beta_t) - self.z * np.sin(alpha_t) * np.cos(beta_t),
-            self.y * np.sin(alpha_t) - self.x * np.cos(alpha_t) * np.sin(beta_t) + self.z * np.cos(alpha_t) * np.cos(beta_t)
-        ])
+        a_local_2 /= 9.8
 
-        omega_cross_r = np.cross(omega_tot.T, r.T).T
-        omega_cross_omega_cross_r = np.cross(omega_tot.T, omega_cross_r.T).T
-        omega_dot_cross_r = np.cross(omega_tot_dot.T, r.T).T
-        a = -(omega_dot_cross_r + omega_cross_omega_cross_r) 
+        np.add(g_local_2, a_local_2, out=a_tot_local_2)
 
-        g = np.array([[0], [0], [1]]) 
+        return time_array, g_local_2, a_local_2, a_tot_local_2
 
-        R_y_T = np.array([
-            [np.cos(beta_t), np.zeros_like(beta_t), -np.sin(beta_t)],
-            [np.zeros_like(beta_t), np.ones_like(beta_t), np.zeros_like(beta_t)],
-            [np.sin(beta_t), np.zeros_like(beta_t), np.cos(beta_t)]
-        ])  
+class TimeAveragedGravity:
+    def __init__(self, omega_alpha_rpm, omega_beta_rpm, alpha_0_deg, beta_0_deg):
+        self.omega_alpha = omega_alpha_rpm * np.pi / 30
+        self.omega_beta = omega_beta_rpm * np.pi / 30
+        self.alpha_0 = np.radians(alpha_0_deg)
+        self.beta_0 = np.radians(beta_0_deg)
 
-        R_x_T = np.array([
-            [np.ones_like(alpha_t), np.zeros_like(alpha_t), np.zeros_like(alpha_t)],
-            [np.zeros_like(alpha_t), np.cos(alpha_t), np.sin(alpha_t)],
-            [np.zeros_like(alpha_t), -np.sin(alpha_t), np.cos(alpha_t)]
-        ]) 
+    def mean_sin(self, omega, phase, time_array):
+        return np.sin(omega * time_array / 2 + phase) * np.sinc(omega * time_array / (2 * np.pi))
 
-        a_local_2 = np.einsum('ijk,jk->ik', R_y_T, np.einsum('ijk,jk->ik', R_x_T, a)) / 9.8
+    def mean_cos(self, omega, phase, time_array):
+        return np.cos(omega * time_array / 2 + phase) * np.sinc(omega * time_array / (2 * np.pi))
 
-        g_local_2 = np.einsum('ijk,jk->ik', R_y_T, np.einsum('ijk,jk->ik', R_x_T, g))
+    def evaluate(self, time_array):
+        time_array = np.asarray(time_array, dtype=float)
+        omega_sum, phase_sum = self.omega_beta + self.omega_alpha, self.beta_0 + self.alpha_0
+        omega_diff, phase_diff = self.omega_beta - self.omega_alpha, self.beta_0 - self.alpha_0
 
-        a_tot_local_2 = g_local_2 + a_local_2
+        # g_local = (-sin(beta) cos(alpha), sin(alpha), cos(beta) cos(alpha)), averaged over [0, t] analytically.
+        g_x_avg = -(self.mean_sin(omega_sum, phase_sum, time_array) + self.mean_sin(omega_diff, phase_diff, time_array)) / 2
+        g_y_avg = self.mean_sin(self.omega_alpha, self.alpha_0, time_array)
+        g_z_avg = (self.mean_cos(omega_diff, phase_diff, time_array) + self.mean_cos(omega_sum, phase_sum, time_array)) / 2
+        g_magnitude = np.sqrt(g_x_avg**2 + g_y_avg**2 + g_z_avg**2)
 
-        return time_array, g_local_2, a_local_2, a_tot_local_2
\ No newline at end of file
+        return g_x_avg, g_y_avg, g_z_avg, g_magnitude
@@ -0,0 +1,168 @@
+import json
+import os
+import shutil
+import numpy as np
+from decimation import MinMaxPyramid, min_max_levels
+from result_cache import DiskCache, default_cache_directory, fingerprint
+from streaming import AccelerometerStreamingAnalysis
+
+RECORDING_VERSION = 2
+DEFAULT_RECORDING_BYTES = 4 * 1024 * 1024 * 1024
+RECORDING_PYRAMID_BASE_BIN = 64
+COLUMN_NAMES = ("time_in_hours", "x", "y", "z")
+AVERAGE_NAMES = ("x_avg", "y_avg", "z_avg", "magnitude")
+PYRAMID_PARTS = ("indices", "x", "y")
+SUMMARY_FIELDS = ("num_samples", "avg_g_magnitude", "distribution", "max_time", "any_nonzero", "path", "converged_at")
+
+def default_recording_directory():
+    return os.path.join(os.path.dirname(default_cache_directory()), "recordings")
+
+def recording_path_for(file_path, directory=None):
+    status = os.stat(file_path)
+    key = fingerprint(RECORDING_VERSION, os.path.abspath(file_path), status.st_size, status.st_mtime_ns)
+    return os.path.join(directory or default_recording_directory(), key + ".kmrec")
+
+def is_recording(path):
+    return os.path.isfile(os.path.join(path, "header.json"))
+
+class RecordingWriter:
+    def __init__(self, path, source_format, max_bytes=DEFAULT_RECORDING_BYTES):
+        self.path = path
+        # a leading dot keeps a recording that is still being written out of eviction
+        self.temp_path = os.path.join(os.path.dirname(path), "." + os.path.basename(path) + ".tmp")
+        self.source_format = source_format
+        self.max_bytes = max_bytes
+        shutil.rmtree(self.temp_path, ignore_errors=True)
+        os.makedirs(self.temp_path)
+        self.files = {name: open(os.path.join(self.temp_path, name + ".f64"), "wb") for name in COLUMN_NAMES + AVERAGE_NAMES + ("search_time",)}
+        self.num_samples = 0
+        self.running_sum = np.zeros(3)
+        self.last_time = -np.inf
+        self.monotonic = True
+
+    def append(self, time_block, x, y, z):
+        columns = [np.ascontiguousarray(column, dtype=np.float64) for column in (time_block, x, y, z)]
+        num_new = columns[0].size
+        if num_new == 0:
+            return
+
+        # the running averages are stored next to the samples, so opening a recording never has to sum it again
+        counts = np.arange(self.num_samples + 1, self.num_samples + num_new + 1)
+        cumulative = np.cumsum(np.vstack(columns[1:]), axis=1) + self.running_sum[:, None]
+        averages = cumulative / counts
+        magnitude = np.sqrt(averages[0]**2 + averages[1]**2 + averages[2]**2)
+        # a running maximum of the time is sorted, so a clock that steps back can still be searched by bisection
+        search_time = np.maximum.accumulate(np.append(self.last_time, columns[0]))[1:]
+        for name, column in zip(COLUMN_NAMES + AVERAGE_NAMES + ("search_time",), columns + list(averages) + [magnitude, search_time]):
+            self.files[name].write(column.tobytes())
+
+        self.monotonic = self.monotonic and columns[0][0] >= self.last_time and bool(np.all(np.diff(columns[0]) >= 0))
+        self.last_time = search_time[-1]
+        self.running_sum = cumulative[:, -1]
+        self.num_samples += num_new
+
+    def written_column(self, name):
+        return np.memmap(os.path.join(self.temp_path, name + ".f64"), dtype=np.float64, mode="r", shape=(self.num_samples,))
+
+    def save_pyramid(self, name):
+        levels = min_max_levels(self.written_column("time_in_hours"), self.written_column(name), RECORDING_PYRAMID_BASE_BIN)
+        for position, part in enumerate(PYRAMID_PARTS, 1):
+            values = np.concatenate([level[position] for level in levels]) if levels else np.empty((0, 2))
+            np.save(os.path.join(self.temp_path, name + "_" + part + ".npy"), values)
+        return [[level[0], len(level[1])] for level in levels]
+
+    def close(self, summary):
+        for file in self.files.values():
+            file.close()
+        if self.monotonic:
+            os.remove(os.path.join(self.temp_path, "search_time.f64"))
+
+        pyramids = {name: self.save_pyramid(name) for name in AVERAGE_NAMES} if self.num_samples else {}
+        np.savez(os.path.join(self.temp_path, "summary.npz"), **{name: np.asarray(summary[name]) for name in SUMMARY_FIELDS})
+        with open(os.path.join(self.temp_path, "header.json"), "w") as file:
+            json.dump({
+                "version": RECORDING_VERSION,
+                "num_samples": self.num_samples,
+                "source_format": self.source_format,
+                "monotonic": self.monotonic,
+                "pyramids": pyramids,
+            }, file)
+
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.replace(self.temp_path, self.path)
+        DiskCache(os.path.dirname(self.path), self.max_bytes).evict(keep=(self.path,))
+
+    def abort(self):
+        for file in self.files.values():
+            try:
+                file.close()
+            except OSError:
+                pass
+        shutil.rmtree(self.temp_path, ignore_errors=True)
+
+class AccelerometerRecording:
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "header.json")) as file:
+            self.header = json.load(file)
+        if self.header["version"] != RECORDING_VERSION:
+            raise ValueError("Unsupported recording version.")
+
+        self.num_samples = self.header["num_samples"]
+        self.source_format = self.header["source_format"]
+        with np.load(os.path.join(path, "summary.npz")) as summary:
+            self.summary = {name: summary[name] for name in SUMMARY_FIELDS}
+        self.time_in_hours, self.x, self.y, self.z = (self.open_column(name) for name in COLUMN_NAMES)
+        self.x_avg, self.y_avg, self.z_avg, self.magnitude = (self.open_column(name) for name in AVERAGE_NAMES)
+        self.search_time = self.time_in_hours if self.header["monotonic"] else self.open_column("search_time")
+        try:
+            # opening a recording counts as a use, so eviction removes the least recently opened first
+            os.utime(path)
+        except OSError:
+            pass
+
+    def open_column(self, name):
+        if self.num_samples == 0:
+            return np.empty(0)
+        return np.memmap(os.path.join(self.path, name + ".f64"), dtype=np.float64, mode="r", shape=(self.num_samples,))
+
+    def __len__(self):
+        return self.num_samples
+
+    def columns(self):
+        return self.time_in_hours, self.x, self.y, self.z
+
+    def time_averages(self):
+        return self.x_avg, self.y_avg, self.z_avg
+
+    def pyramid(self, name):
+        levels = []
+        if self.header["pyramids"].get(name):
+            parts = [np.load(os.path.join(self.path, name + "_" + part + ".npy"), mmap_mode="r") for part in PYRAMID_PARTS]
+            offset = 0
+            for bin_size, length in self.header["pyramids"][name]:
+                levels.append((bin_size, *(values[offset:offset + length] for values in parts)))
+                offset += length
+        return MinMaxPyramid(self.time_in_hours, getattr(self, name), levels=levels, search_x=self.search_time)
+
+    def find_index(self, hours):
+        return int(np.searchsorted(self.search_time, hours, side="left"))
+
+    def window(self, start_index, end_index):
+        end_index = max(end_index, start_index)
+        return self.x[start_index:end_index], self.y[start_index:end_index], self.z[start_index:end_index]
+
+    def window_magnitude(self, start_index, end_index):
+        return self.magnitude[start_index:max(end_index, start_index)]
+
+def write_recording(experimental_data, path):
+    writer = RecordingWriter(path, experimental_data.source_format)
+    try:
+        analysis = AccelerometerStreamingAnalysis("recording")
+        analysis.update(*experimental_data.columns())
+        writer.append(*experimental_data.columns())
+        writer.close(analysis.result())
+    except BaseException:
+        writer.abort()
+        raise
+    return AccelerometerRecording(path)
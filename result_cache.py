@@ -0,0 +1,178 @@
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+
+DEFAULT_CACHE_BYTES = 256 * 1024 * 1024
+DEFAULT_DISK_CACHE_BYTES = 2 * 1024 * 1024 * 1024
+
+def fingerprint(*values):
+    digest = hashlib.blake2b(digest_size=16)
+    for value in values:
+        if isinstance(value, (np.ndarray, list)):
+            array = np.ascontiguousarray(value, dtype=float)
+            digest.update(f"{array.dtype}{array.shape}".encode())
+            digest.update(array.tobytes() if array.ndim == 0 else array.data)
+        else:
+            digest.update(repr(value).encode())
+        digest.update(b"|")
+    return digest.hexdigest()
+
+def result_size(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(result_size(item) for item in value)
+    if isinstance(value, dict):
+        return sum(result_size(item) for item in value.values())
+    return sys.getsizeof(value)
+
+def freeze(value):
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            freeze(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            freeze(item)
+    return value
+
+def default_cache_directory():
+    base_directory = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base_directory, "Kinematics-Model", "cache")
+
+class DiskCache:
+    def __init__(self, directory=None, max_bytes=DEFAULT_DISK_CACHE_BYTES, version=0):
+        self.directory = directory or default_cache_directory()
+        self.max_bytes = max_bytes
+        self.version = version
+        os.makedirs(self.directory, exist_ok=True)
+
+    def entry_path(self, key):
+        return os.path.join(self.directory, fingerprint(self.version, *key))
+
+    def get(self, key):
+        path = self.entry_path(key)
+        if not os.path.isdir(path):
+            return None
+        try:
+            names = sorted((name for name in os.listdir(path) if name.endswith(".npy")), key=lambda name: int(name[:-4]))
+            value = tuple(np.load(os.path.join(path, name), mmap_mode="r") for name in names)
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return value
+
+    def put(self, key, value):
+        value = tuple(np.asarray(item) for item in value)
+        path = self.entry_path(key)
+        temp_path = tempfile.mkdtemp(prefix=".tmp-", dir=self.directory)
+        try:
+            for index, item in enumerate(value):
+                np.save(os.path.join(temp_path, f"{index}.npy"), item)
+            os.replace(temp_path, path)
+        except OSError:
+            shutil.rmtree(temp_path, ignore_errors=True)
+        self.evict()
+        return value
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key)
+        if value is None:
+            value = self.put(key, compute())
+        return value
+
+    def entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith(".") or not os.path.isdir(path):
+                continue
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(path))
+                entries.append((os.path.getmtime(path), size, path))
+            except OSError:
+                continue
+        return entries
+
+    def evict(self, keep=()):
+        entries = sorted(self.entries())
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            if path in keep:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            if not os.path.exists(path):
+                total_bytes -= size
+
+    def clear(self):
+        for _, _, path in self.entries():
+            shutil.rmtree(path, ignore_errors=True)
+
+class ResultCache:
+    def __init__(self, max_bytes=DEFAULT_CACHE_BYTES, disk_cache=None):
+        self.max_bytes = max_bytes
+        self.disk_cache = disk_cache
+        self.entries = OrderedDict()
+        self.sizes = {}
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.RLock()
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key, default=None):
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+    def put(self, key, value):
+        size = result_size(value)
+        with self.lock:
+            self.discard(key)
+            if size > self.max_bytes:
+                return value
+
+            self.entries[key] = freeze(value)
+            self.sizes[key] = size
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes:
+                self.discard(next(iter(self.entries)))
+        return value
+
+    def get_or_compute(self, key, compute, persist=False):
+        # the lock is not held while computing, so a background job never blocks lookups from the GUI
+        value = self.get(key)
+        if value is not None:
+            return value
+        if persist and self.disk_cache is not None:
+            return self.put(key, self.disk_cache.get_or_compute(key, compute))
+        return self.put(key, compute())
+
+    def discard(self, key):
+        with self.lock:
+            if key in self.entries:
+                del self.entries[key]
+                self.total_bytes -= self.sizes.pop(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.sizes.clear()
+            self.total_bytes = 0
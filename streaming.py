@@ -0,0 +1,187 @@
+import numpy as np
+from convergence import DEFAULT_CONVERGENCE_THRESHOLD
+from fibonacci_lattice import CoverageTracker
+from math_model import DEFAULT_BLOCK_BYTES
+
+DEFAULT_PLOT_POINTS = 20000
+
+class DecimatedSeries:
+    def __init__(self, num_columns, max_points=DEFAULT_PLOT_POINTS):
+        self.max_points = max_points
+        self.stride = 1
+        self.num_samples = 0
+        self.indices = np.empty(0, dtype=np.int64)
+        self.columns = [np.empty(0) for _ in range(num_columns)]
+        self.last_values = None
+
+    def append(self, *columns):
+        num_new = len(columns[0])
+        if num_new == 0:
+            return
+
+        keep = np.arange((-self.num_samples) % self.stride, num_new, self.stride)
+        self.indices = np.concatenate((self.indices, self.num_samples + keep))
+        self.columns = [np.concatenate((stored, np.asarray(column)[keep])) for stored, column in zip(self.columns, columns)]
+        while self.indices.size > self.max_points:
+            self.stride *= 2
+            coarse = self.indices % self.stride == 0
+            self.indices = self.indices[coarse]
+            self.columns = [stored[coarse] for stored in self.columns]
+
+        self.num_samples += num_new
+        self.last_values = [column[-1] for column in columns]
+
+    def get(self):
+        if self.num_samples == 0 or self.indices[-1] == self.num_samples - 1:
+            return self.indices, self.columns
+        indices = np.append(self.indices, self.num_samples - 1)
+        return indices, [np.append(stored, value) for stored, value in zip(self.columns, self.last_values)]
+
+class StreamingAnalysis:
+    def __init__(self, ID="streaming", score_distribution=True, num_points=1000):
+        self.ID = ID
+        self.score_distribution = score_distribution
+        self.num_points = num_points
+        self.coverage = CoverageTracker(ID, num_points)
+        self.num_samples = 0
+        self.end_time = 0.0
+        self.g_sum = np.zeros(3)
+        self.a_sum = np.zeros(3)
+        self.g_magnitude_sum = 0.0
+        self.a_magnitude_sum = 0.0
+
+    def running_average(self, block, running_sum):
+        counts = np.arange(self.num_samples + 1, self.num_samples + block.shape[1] + 1)
+        averages = (np.cumsum(block, axis=1) + running_sum[:, None]) / counts
+        magnitude = np.sqrt(averages[0]**2 + averages[1]**2 + averages[2]**2)
+        return averages, magnitude
+
+    def update(self, time_block, g_block, a_block, a_tot_block):
+        if time_block.size == 0:
+            return time_block, g_block, np.empty(0), a_block, np.empty(0)
+
+        g_avg, g_magnitude = self.running_average(g_block, self.g_sum)
+        a_avg, a_magnitude = self.running_average(a_block, self.a_sum)
+
+        self.g_sum += g_block.sum(axis=1)
+        self.a_sum += a_block.sum(axis=1)
+        self.g_magnitude_sum += g_magnitude.sum()
+        self.a_magnitude_sum += a_magnitude.sum()
+        self.num_samples += time_block.size
+        self.end_time = time_block[-1]
+
+        if self.score_distribution:
+            self.coverage.update(a_tot_block[0], a_tot_block[1], a_tot_block[2], time_block)
+
+        return time_block.copy(), g_avg, g_magnitude, a_avg, a_magnitude
+
+    def result(self):
+        num_samples = max(self.num_samples, 1)
+        return {
+            "num_samples": self.num_samples,
+            "end_time": self.end_time,
+            "g_avg": self.g_sum / num_samples,
+            "a_avg": self.a_sum / num_samples,
+            "avg_g_magnitude": self.g_magnitude_sum / num_samples,
+            "avg_a_magnitude": self.a_magnitude_sum / num_samples,
+            "distribution": self.coverage.getDistribution() if self.score_distribution else None,
+            "coverage": self.coverage.getHistogram(),
+        }
+
+def analyze_stream(model, block_size=None, max_block_bytes=DEFAULT_BLOCK_BYTES, score_distribution=True, num_points=1000, callback=None):
+    analysis = StreamingAnalysis("streaming", score_distribution, num_points)
+    for block in model.iterate_acceleration(block_size, max_block_bytes, reuse_buffers=True):
+        averages = analysis.update(*block)
+        if callback is not None:
+            callback(averages)
+    return analysis.result()
+
+class AccelerometerStreamingAnalysis(StreamingAnalysis):
+    def __init__(self, ID="experimental", start_analysis=None, end_analysis=None, num_points=1000, max_plot_points=DEFAULT_PLOT_POINTS):
+        super().__init__(ID, True, num_points)
+        self.start_analysis = start_analysis
+        self.end_analysis = end_analysis
+        self.max_time = -np.inf
+        self.any_nonzero = np.zeros(3, dtype=bool)
+        self.series = DecimatedSeries(5, max_plot_points)
+        self.path = DecimatedSeries(3, max_plot_points)
+        self.window_start = None
+        self.window_end = None
+        self.window_magnitude_sum = 0.0
+        self.window_coverage = CoverageTracker(ID + "_analysis", num_points)
+        self.window_path = DecimatedSeries(3, max_plot_points)
+        self.converged_at = None
+
+    def has_window(self):
+        return self.start_analysis is not None and self.end_analysis is not None
+
+    def find_window_bounds(self, time_block):
+        if self.window_start is None:
+            crossings = np.flatnonzero(time_block >= self.start_analysis)
+            if crossings.size:
+                self.window_start = self.num_samples + crossings[0]
+        if self.window_end is None:
+            crossings = np.flatnonzero(time_block >= self.end_analysis)
+            if crossings.size:
+                self.window_end = self.num_samples + crossings[0]
+
+    def update(self, time_block, x, y, z):
+        time_block = np.asarray(time_block, dtype=float)
+        if time_block.size == 0:
+            return
+
+        block = np.vstack((x, y, z))
+        g_avg, g_magnitude = self.running_average(block, self.g_sum)
+        self.series.append(time_block, g_avg[0], g_avg[1], g_avg[2], g_magnitude)
+        self.path.append(x, y, z)
+        self.coverage.update(x, y, z, time_block)
+
+        # the average has converged after the last sample above the threshold, so a block that stays below keeps the earlier time
+        above = np.flatnonzero(g_magnitude >= DEFAULT_CONVERGENCE_THRESHOLD)
+        if above.size:
+            self.converged_at = time_block[above[-1] + 1] if above[-1] + 1 < time_block.size else None
+        elif self.converged_at is None:
+            self.converged_at = time_block[0]
+
+        if self.has_window():
+            self.find_window_bounds(time_block)
+            if self.window_start is not None:
+                start = max(self.window_start - self.num_samples, 0)
+                stop = time_block.size if self.window_end is None else min(max(self.window_end - self.num_samples, 0), time_block.size)
+                if stop > start:
+                    self.window_magnitude_sum += g_magnitude[start:stop].sum()
+                    self.window_coverage.update(x[start:stop], y[start:stop], z[start:stop], time_block[start:stop])
+                    self.window_path.append(x[start:stop], y[start:stop], z[start:stop])
+
+        self.g_sum += block.sum(axis=1)
+        self.g_magnitude_sum += g_magnitude.sum()
+        self.any_nonzero |= block.any(axis=1)
+        self.max_time = max(self.max_time, time_block.max())
+        self.num_samples += time_block.size
+        self.end_time = time_block[-1]
+
+    def result(self):
+        result = super().result()
+        series_indices, (time_in_hours, x_avg, y_avg, z_avg, magnitude) = self.series.get()
+        _, path = self.path.get()
+        window_indices, window_path = self.window_path.get()
+        window_samples = self.window_coverage.numSamples
+        analysis_window = None
+        if self.has_window():
+            # the window bounds are sample numbers, so they map straight onto the decimated series that keeps them
+            window_bounds = [self.num_samples if bound is None else bound for bound in (self.window_start, self.window_end)]
+            analysis_window = tuple(int(index) for index in np.searchsorted(series_indices, window_bounds))
+        result.update({
+            "max_time": self.max_time,
+            "any_nonzero": self.any_nonzero,
+            "time_in_hours": time_in_hours,
+            "time_avg": (x_avg, y_avg, z_avg),
+            "magnitude": magnitude,
+            "analysis_window": analysis_window,
+            "path": tuple(path),
+            "avg_window_magnitude": self.window_magnitude_sum / window_samples if window_samples else np.nan,
+            "window_path": tuple(window_path) if self.has_window() else None,
+            "window_coverage_by_frame": np.concatenate(([0], self.window_coverage.getCoverageAt(window_indices))),
+            "converged_at": np.nan if self.converged_at is None else float(self.converged_at),
+        })
+        return result
@@ -0,0 +1,100 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+import numpy as np
+from math_model import DEFAULT_SAMPLE_INTERVAL, MathModel, SWEEP_RESULT_DTYPE
+
+INPUT_FIELDS = SWEEP_RESULT_DTYPE.names[:8]
+
+def run_sweep_chunk(results_name, done_name, num_conditions, indices, inputs, sample_interval, score_distribution, num_points):
+    results_shm = shared_memory.SharedMemory(name=results_name)
+    done_shm = shared_memory.SharedMemory(name=done_name)
+    try:
+        results = np.ndarray(num_conditions, dtype=SWEEP_RESULT_DTYPE, buffer=results_shm.buf)
+        done = np.ndarray(num_conditions, dtype=np.uint8, buffer=done_shm.buf)
+        results[indices] = MathModel.sweep(*inputs, sample_interval=sample_interval, score_distribution=score_distribution, num_points=num_points)
+        done[indices] = 1
+        del results, done
+    finally:
+        results_shm.close()
+        done_shm.close()
+    return indices
+
+class SweepRunner:
+    def __init__(self, omega_alpha_rpm, omega_beta_rpm, alpha_0_deg=0.0, beta_0_deg=0.0, x=0.0, y=0.0, z=0.0, duration_hours=1.0,
+                 sample_interval=DEFAULT_SAMPLE_INTERVAL, max_workers=None, chunk_size=None, checkpoint_path=None, score_distribution=True, num_points=1000):
+        params = np.broadcast_arrays(*[np.asarray(p, dtype=float) for p in (omega_alpha_rpm, omega_beta_rpm, alpha_0_deg, beta_0_deg, x, y, z, duration_hours, sample_interval)])
+        self.shape = params[0].shape
+        self.inputs = [p.ravel() for p in params[:-1]]
+        self.sample_interval = params[-1].ravel()
+        self.num_conditions = self.inputs[0].size
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size or max(1, -(-self.num_conditions // (self.max_workers * 4)))
+        self.checkpoint_path = checkpoint_path
+        self.score_distribution = score_distribution
+        self.num_points = num_points
+
+    def load_checkpoint(self, results, done):
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return
+        with np.load(self.checkpoint_path) as checkpoint:
+            if 'sample_interval' not in checkpoint:
+                raise ValueError("Checkpoint does not match the sweep grid.")
+            saved_results, saved_done = checkpoint['results'], checkpoint['done']
+            saved_sample_interval, saved_settings = checkpoint['sample_interval'], checkpoint['settings']
+        # done flags are kept per condition, so a resumed sweep may use a different worker count or chunk size
+        if saved_results.shape != results.shape or saved_done.shape != done.shape:
+            raise ValueError("Checkpoint does not match the sweep grid.")
+        for name, values in zip(INPUT_FIELDS, self.inputs):
+            if not np.array_equal(saved_results[name], values):
+                raise ValueError("Checkpoint does not match the sweep grid.")
+        if not np.array_equal(saved_sample_interval, self.sample_interval):
+            raise ValueError("Checkpoint does not match the sweep sample interval.")
+        if not np.array_equal(saved_settings, self.settings()):
+            raise ValueError("Checkpoint does not match the sweep scoring settings.")
+        results[:] = saved_results
+        done[:] = saved_done
+
+    def settings(self):
+        return np.array([self.score_distribution, self.num_points], dtype=np.int64)
+
+    def save_checkpoint(self, results, done):
+        if not self.checkpoint_path:
+            return
+        temp_path = self.checkpoint_path + ".tmp.npz"
+        np.savez(temp_path, results=results, done=done, sample_interval=self.sample_interval, settings=self.settings())
+        os.replace(temp_path, self.checkpoint_path)
+
+    def run(self):
+        results_shm = shared_memory.SharedMemory(create=True, size=max(1, self.num_conditions * SWEEP_RESULT_DTYPE.itemsize))
+        done_shm = shared_memory.SharedMemory(create=True, size=max(1, self.num_conditions))
+        try:
+            results = np.ndarray(self.num_conditions, dtype=SWEEP_RESULT_DTYPE, buffer=results_shm.buf)
+            done = np.ndarray(self.num_conditions, dtype=np.uint8, buffer=done_shm.buf)
+            results[:] = 0
+            done[:] = 0
+            for name, values in zip(INPUT_FIELDS, self.inputs):
+                results[name] = values
+            self.load_checkpoint(results, done)
+
+            pending = np.flatnonzero(done == 0)
+            chunks = [pending[start:start + self.chunk_size] for start in range(0, pending.size, self.chunk_size)]
+            if chunks:
+                with ProcessPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+                    futures = []
+                    for indices in chunks:
+                        inputs = [values[indices] for values in self.inputs]
+                        futures.append(executor.submit(run_sweep_chunk, results_shm.name, done_shm.name, self.num_conditions, indices, inputs,
+                                                       self.sample_interval[indices], self.score_distribution, self.num_points))
+                    for future in as_completed(futures):
+                        future.result()
+                        self.save_checkpoint(results, done)
+
+            output = results.copy().reshape(self.shape)
+            del results, done
+            return output
+        finally:
+            results_shm.close()
+            results_shm.unlink()
+            done_shm.close()
+            done_shm.unlink()
@@ -0,0 +1,53 @@
+import numpy as np
+
+class TimeIndex:
+    def __init__(self, time_in_hours, **series):
+        time_in_hours = np.asarray(time_in_hours, dtype=float)
+        # a running maximum is sorted, so a binary search over it finds the same first crossing as a linear scan
+        self.search_times = np.maximum.accumulate(time_in_hours) if time_in_hours.size else time_in_hours
+        self.num_samples = time_in_hours.size
+        self.prefix_sums = {}
+        for name, values in series.items():
+            values = np.asarray(values, dtype=float)
+            if values.shape[-1] != self.num_samples:
+                raise ValueError(f"Series {name} does not match the time array.")
+            zeros = np.zeros(values.shape[:-1] + (1,))
+            self.prefix_sums[name] = np.concatenate((zeros, np.cumsum(values, axis=-1)), axis=-1)
+
+    def __len__(self):
+        return self.num_samples
+
+    def find_index(self, hours):
+        return int(np.searchsorted(self.search_times, hours, side="left"))
+
+    def find_indices(self, hours):
+        return np.searchsorted(self.search_times, np.asarray(hours, dtype=float), side="left")
+
+    def window(self, start_analysis, end_analysis):
+        return self.find_index(start_analysis), self.find_index(end_analysis)
+
+    def mean(self, name, start_analysis, end_analysis):
+        start_index, end_index = self.window(start_analysis, end_analysis)
+        return self.mean_between(name, start_index, end_index)
+
+    def mean_between(self, name, start_index, end_index):
+        prefix_sums = self.prefix_sums[name]
+        end_index = max(end_index, start_index)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return (prefix_sums[..., end_index] - prefix_sums[..., start_index]) / (end_index - start_index)
+
+    def window_stats(self, start_analysis, end_analysis):
+        stats = self.batch_window_stats([start_analysis], [end_analysis])
+        return {name: value[..., 0] for name, value in stats.items()}
+
+    def batch_window_stats(self, start_analyses, end_analyses):
+        start_indices = self.find_indices(start_analyses)
+        end_indices = np.maximum(self.find_indices(end_analyses), start_indices)
+        num_samples = end_indices - start_indices
+        stats = {"start_index": start_indices, "end_index": end_indices, "num_samples": num_samples}
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for name, prefix_sums in self.prefix_sums.items():
+                stats[name] = (prefix_sums[..., end_indices] - prefix_sums[..., start_indices]) / num_samples
+                if prefix_sums.ndim == 2:
+                    stats[name + "_magnitude"] = np.sqrt(np.sum(stats[name]**2, axis=0))
+        return stats